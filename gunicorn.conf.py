@@ -0,0 +1,44 @@
+"""Gunicorn hooks that warm workers up before they take traffic
+
+gunicorn reads this file when started from the project directory.
+Start it with --preload (or GUNICORN_PRELOAD=True) to warm the master once
+and let every forked worker share the compiled templates copy-on-write.
+"""
+import gc
+import os
+import time
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'False').lower() == 'true'
+
+_started = time.perf_counter()
+
+def on_starting(server):
+    # Cached pages and About are invalidated through the cache; without a
+    # shared one, edits made in one worker or by a management command would
+    # never reach the others. ALLOW_LOCAL_CACHE=True accepts that, e.g. for a
+    # load test that never edits content
+    if server.cfg.workers > 1 and not os.environ.get('REDIS_URL'):
+        message = f'{server.cfg.workers} workers need a shared cache: set REDIS_URL, or run a single worker'
+        if os.environ.get('ALLOW_LOCAL_CACHE', 'False').lower() != 'true':
+            raise RuntimeError(message)
+        server.log.warning(f'{message}; continuing with a per-process cache (ALLOW_LOCAL_CACHE)')
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        from main.warmup import warm_up
+        warm_up()
+        # Objects that survive to here live as long as the master; freezing them
+        # keeps the collector from touching, and so copying, their pages in workers
+        gc.freeze()
+    server.log.info(f'Master ready in {(time.perf_counter() - _started) * 1000:.0f} ms')
+
+def post_fork(server, worker):
+    worker.forked_at = time.perf_counter()
+
+def post_worker_init(worker):
+    if not worker.cfg.preload_app:
+        from main.warmup import warm_up
+        warm_up()
+    from main.contact_queue import start_contact_queue
+    start_contact_queue()
+    worker.log.info(f'Worker {worker.pid} booted in {(time.perf_counter() - worker.forked_at) * 1000:.0f} ms')
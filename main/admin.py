@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
-from .models import About, Experience, Project, ContactMessage, Skill
+from .models import About, Experience, Project, ContactMessage, Skill, Technology
 
 @admin.register(About)
 class AboutAdmin(admin.ModelAdmin):
@@ -151,6 +151,16 @@ class SkillAdmin(admin.ModelAdmin):
         }),
     )
 
+@admin.register(Technology)
+class TechnologyAdmin(admin.ModelAdmin):
+    list_display = ['name', 'key']
+    search_fields = ['name', 'key']
+    readonly_fields = ['name', 'key']
+    
+    def has_add_permission(self, request):
+        # Technologies are maintained from Project.frameworks
+        return False
+
 # Customize admin site
 admin.site.site_header = "Abdulaziz Portfolio Admin"
 admin.site.site_title = "Portfolio Admin"
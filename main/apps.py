@@ -3,3 +3,10 @@ from django.apps import AppConfig
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate
+        from . import metrics, signals
+        post_migrate.connect(signals.create_search_index, sender=self)
+        connection_created.connect(metrics.install_query_wrapper)
@@ -0,0 +1,211 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Count, Max
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods, condition
+from .models import Experience, Project, ContactMessage, Technology
+from .cache import cache_page_by_content
+from .context_processors import aget_about
+from .gallery import aload_gallery
+from .icons import aget_icon_matcher
+from .contact_queue import get_contact_queue
+from .notifications import notify_new_messages
+from .views import (
+    PROJECTS_PAGE_SIZE, CONTACT_SUCCESS_MESSAGE, CONTACT_FAILURE_MESSAGE,
+    _filter_projects, _clean_contact, _contact_rejection, _contact_error, _remember_contact,
+    _projects_etag, _projects_last_modified, _project_page_query, _project_page_response,
+)
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Async counterparts of main.views, served when running under ASGI.
+# Querysets are fully evaluated before rendering because templates may
+# not touch the database from the event loop.
+
+async def _load_profile():
+    """Refresh the process-wide About and skill icons, which templates read synchronously"""
+    await aget_about()
+    await aget_icon_matcher()
+
+@cache_page_by_content()
+async def home(request):
+    """Home page view with featured content"""
+    try:
+        await _load_profile()
+        featured_projects = [
+            project async for project in
+            Project.objects.filter(is_featured=True).order_by('order', '-created_at')[:3]
+        ]
+        recent_experiences = [
+            experience async for experience in
+            Experience.objects.all().order_by('-start_date', 'order')[:3]
+        ]
+
+        context = {
+            'featured_projects': featured_projects,
+            'recent_experiences': recent_experiences,
+            'page_title': 'Home',
+        }
+        return render(request, 'main/home.html', context)
+    except Exception as e:
+        logger.error(f"Error in home view: {e}")
+        return render(request, 'errors/500.html', status=500)
+
+@cache_page_by_content()
+async def about_view(request):
+    """About page view with detailed information"""
+    try:
+        await _load_profile()
+        experiences = [
+            experience async for experience in
+            Experience.objects.all().order_by('-start_date', 'order')
+        ]
+
+        context = {
+            'experiences': experiences,
+            'work_experiences': [e for e in experiences if e.experience_type == 'work'],
+            'education_experiences': [e for e in experiences if e.experience_type == 'education'],
+            'certifications': [e for e in experiences if e.experience_type == 'certification'],
+            'page_title': 'About',
+        }
+        return render(request, 'main/about.html', context)
+    except Exception as e:
+        logger.error(f"Error in about view: {e}")
+        return render(request, 'errors/500.html', status=500)
+
+@cache_page_by_content(query_params=('search', 'featured', 'tech', 'page'))
+async def projects_view(request):
+    """Projects page view with filtering and pagination"""
+    try:
+        # Search backends run raw SQL, so filtering stays on a worker thread
+        projects_list, filters = await sync_to_async(_filter_projects)(request)
+
+        paginator = Paginator(projects_list, PROJECTS_PAGE_SIZE)
+        paginator.count = await projects_list.acount()
+        projects = paginator.get_page(request.GET.get('page'))
+        projects.object_list = [project async for project in projects.object_list]
+
+        technologies = [
+            tech async for tech in
+            Technology.objects.annotate(project_count=Count('projects'))
+            .filter(project_count__gt=0).order_by('name')
+        ]
+
+        context = {
+            'projects': projects,
+            'technologies': technologies,
+            'page_title': 'Projects',
+            **filters,
+        }
+        return render(request, 'main/projects.html', context)
+    except Exception as e:
+        logger.error(f"Error in projects view: {e}")
+        return render(request, 'errors/500.html', status=500)
+
+async def project_detail(request, project_id):
+    """Project detail view"""
+    try:
+        try:
+            project = await Project.objects.aget(id=project_id)
+        except Project.DoesNotExist:
+            return render(request, 'errors/404.html', status=404)
+
+        related_projects = [
+            related async for related in
+            Project.objects.filter(neighbour_of__project=project).order_by('-neighbour_of__score')[:3]
+        ]
+
+        context = {
+            'project': project,
+            'related_projects': related_projects,
+            'gallery': await aload_gallery(project),
+            'page_title': project.title,
+        }
+        return render(request, 'main/project_detail.html', context)
+    except Exception as e:
+        logger.error(f"Error in project detail view: {e}")
+        return render(request, 'errors/500.html', status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def contact_submit(request):
+    """Handle contact form submission"""
+    try:
+        data = json.loads(request.body)
+
+        fields, error = _clean_contact(request, data)
+        if error:
+            return error
+
+        # Cache round trips may block, so keep them off the event loop
+        rejection = await sync_to_async(_contact_rejection)(fields)
+        if rejection:
+            return rejection
+
+        if settings.CONTACT_WRITE_BEHIND and await sync_to_async(get_contact_queue().submit)(fields):
+            logger.info(f"Queued contact message from {fields['email']}")
+        else:
+            contact_message = await ContactMessage.objects.acreate(**fields)
+            logger.info(f"New contact message from {contact_message.email}")
+            notify_new_messages([contact_message])
+        await sync_to_async(_remember_contact)(fields)
+
+        return JsonResponse({
+            'success': True,
+            'message': CONTACT_SUCCESS_MESSAGE
+        })
+
+    except json.JSONDecodeError:
+        return _contact_error('Invalid data format.')
+    except Exception as e:
+        logger.error(f"Error in contact submit: {e}")
+        return _contact_error(CONTACT_FAILURE_MESSAGE, status=500)
+
+@condition(etag_func=_projects_etag, last_modified_func=_projects_last_modified)
+async def _api_projects(request):
+    rows, fields, limit, error = _project_page_query(request)
+    if error:
+        return error
+    return _project_page_response([row async for row in rows], fields, limit)
+
+async def api_projects(request):
+    """API endpoint for projects (for AJAX requests)"""
+    try:
+        # Prime the aggregate so the condition callbacks need no sync query
+        request._projects_state = {
+            'last_modified': (await Project.objects.aaggregate(last_modified=Max('updated_at')))['last_modified'],
+            'count': await Project.objects.acount(),
+        }
+        return await _api_projects(request)
+    except Exception as e:
+        logger.error(f"Error in API projects: {e}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Error fetching projects.'
+        }, status=500)
+
+async def api_skills(request):
+    """API endpoint for skills"""
+    try:
+        about = await aget_about()
+        if not about:
+            return JsonResponse({
+                'success': False,
+                'message': 'No skills data found.'
+            }, status=404)
+
+        return JsonResponse({
+            'success': True,
+            'skills': about.get_skills_list()
+        })
+    except Exception as e:
+        logger.error(f"Error in API skills: {e}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Error fetching skills.'
+        }, status=500)
@@ -0,0 +1,239 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from functools import wraps
+from hashlib import md5
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.safestring import mark_safe
+from .metrics import get_registry
+from urllib.parse import urlencode
+import asyncio
+import threading
+import time
+
+CONTENT_VERSION_KEY = 'main:content_version'
+PAGE_CACHE_PREFIX = 'main:page'
+
+def get_version(key):
+    """Return the counter stored under key, creating it if needed"""
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses old keys
+        cache.add(key, int(time.time()), None)
+        version = cache.get(key, 0)
+    return version
+
+def bump_version(key):
+    """Move the counter stored under key on, so holders of the old one notice"""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = int(time.time())
+        cache.set(key, version, None)
+        return version
+
+async def aget_version(key):
+    """Async counterpart of get_version"""
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, int(time.time()), None)
+        version = await cache.aget(key, 0)
+    return version
+
+def get_content_version():
+    """Return the current content version used to namespace cached pages"""
+    return get_version(CONTENT_VERSION_KEY)
+
+def bump_content_version():
+    """Invalidate every cached page by moving to a new content version"""
+    return bump_version(CONTENT_VERSION_KEY)
+
+async def aget_content_version():
+    """Async counterpart of get_content_version"""
+    return await aget_version(CONTENT_VERSION_KEY)
+
+class ProcessLocal:
+    """A value loaded once per process and reloaded after any process invalidates it
+
+    invalidate() bumps a version counter in the shared cache, and each
+    process compares its copy against it at most every check_interval
+    seconds. A copy older than max_age seconds is reloaded regardless, which
+    bounds staleness when the cache is not shared between processes and a
+    bump in one never reaches the others. Code running on the event loop
+    never loads synchronously: it keeps the copy it has, and async views
+    refresh it through aget().
+    """
+
+    def __init__(self, key, load, check_interval=1.0, max_age=300.0):
+        self.key = key
+        self.load = load
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self.value = None
+        self.version = None
+        self.checked_at = 0.0
+        self.loaded_at = 0.0
+        self.lock = threading.Lock()
+
+    def fresh(self):
+        return self.version is not None and time.monotonic() - self.checked_at < self.check_interval
+
+    def current(self, version):
+        return version == self.version and time.monotonic() - self.loaded_at < self.max_age
+
+    def get(self):
+        if self.fresh():
+            return self.value
+        if self.version is not None and _in_event_loop():
+            return self.value
+        with self.lock:
+            version = get_version(self.key)
+            if not self.current(version):
+                # Read the version before loading, so a change made meanwhile
+                # leaves this copy stale and triggers another load
+                self.loaded_at = time.monotonic()
+                self.value = self.load()
+                self.version = version
+            self.checked_at = time.monotonic()
+            return self.value
+
+    async def aget(self):
+        if self.fresh():
+            return self.value
+        version = await aget_version(self.key)
+        if not self.current(version):
+            self.loaded_at = time.monotonic()
+            self.value = await sync_to_async(self.load)()
+            self.version = version
+        self.checked_at = time.monotonic()
+        return self.value
+
+    def invalidate(self):
+        bump_version(self.key)
+        # Compare against the bumped version on the next get()
+        self.checked_at = 0.0
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+def _page_digest(request, query_params):
+    parts = [request.get_host(), request.path]
+    for param in query_params:
+        parts.append(f"{param}={request.GET.get(param, '')}")
+    return md5('|'.join(parts).encode('utf-8')).hexdigest()
+
+def page_url(request, query_params=()):
+    """Absolute URL of a cached page: its path plus only the parameters in its key
+
+    Anything else (tracking tags and the like) would otherwise be baked into
+    the page and shown to everyone who shares the entry.
+    """
+    query = urlencode([(param, request.GET[param]) for param in query_params if request.GET.get(param)])
+    return request.build_absolute_uri(f"{request.path}?{query}" if query else request.path)
+
+def get_page_cache_key(request, query_params=()):
+    """Build a versioned cache key for a page request"""
+    return f"{PAGE_CACHE_PREFIX}:{get_content_version()}:{_page_digest(request, query_params)}"
+
+async def aget_page_cache_key(request, query_params=()):
+    """Async counterpart of get_page_cache_key"""
+    version = await aget_content_version()
+    return f"{PAGE_CACHE_PREFIX}:{version}:{_page_digest(request, query_params)}"
+
+def _cached_response(cached):
+    content, content_type = cached
+    response = HttpResponse(content, content_type=content_type)
+    response['X-Page-Cache'] = 'HIT'
+    return response
+
+def _cacheable(response):
+    return response.status_code == 200 and not getattr(response, 'streaming', False)
+
+def cache_page_by_content(query_params=()):
+    """Cache a view's full response until portfolio content changes
+
+    Only the listed query parameters take part in the key, so unrelated
+    parameters (tracking tags and the like) share one cache entry.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                request.page_url = page_url(request, query_params)
+                timeout = getattr(settings, 'PAGE_CACHE_TIMEOUT', 0)
+                if request.method not in ('GET', 'HEAD') or not timeout:
+                    return await view_func(request, *args, **kwargs)
+
+                key = await aget_page_cache_key(request, query_params)
+                cached = await cache.aget(key)
+                if cached is not None:
+                    return _cached_response(cached)
+
+                response = await view_func(request, *args, **kwargs)
+                if _cacheable(response):
+                    await cache.aset(key, (response.content, response['Content-Type']), timeout)
+                    response['X-Page-Cache'] = 'MISS'
+                return response
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            request.page_url = page_url(request, query_params)
+            timeout = getattr(settings, 'PAGE_CACHE_TIMEOUT', 0)
+            if request.method not in ('GET', 'HEAD') or not timeout:
+                return view_func(request, *args, **kwargs)
+
+            key = get_page_cache_key(request, query_params)
+            cached = cache.get(key)
+            if cached is not None:
+                return _cached_response(cached)
+
+            response = view_func(request, *args, **kwargs)
+            if _cacheable(response):
+                cache.set(key, (response.content, response['Content-Type']), timeout)
+                response['X-Page-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+FRAGMENT_CACHE_PREFIX = 'main:fragment'
+
+def get_fragment_cache_key(name, ident):
+    """Cache key for the rendered fragments of one object; ident names the object"""
+    return f"{FRAGMENT_CACHE_PREFIX}:{name}:{md5(str(ident).encode('utf-8')).hexdigest()}"
+
+def invalidate_fragment(name, ident):
+    """Forget every cached fragment of one object, on whichever page it appears"""
+    cache.delete(get_fragment_cache_key(name, ident))
+
+def render_fragment(name, ident, stamp, source, render):
+    """Render a template fragment once per object and stamp, sharing it across pages
+
+    All renderings of one object (its card on the home page and on the
+    listing, say) share a key and are told apart by source, a digest of their
+    markup, so one delete drops them all and a deploy that changes the markup
+    renders afresh. Each remembers the stamp (usually updated_at) it was
+    rendered for, so an edited object renders afresh even before its entry
+    is deleted.
+    """
+    timeout = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 0)
+    if not timeout:
+        return render()
+
+    labels = {'fragment': name}
+    key = get_fragment_cache_key(name, ident)
+    renderings = cache.get(key) or {}
+    cached = renderings.get(source)
+    if cached is not None and cached[0] == stamp:
+        get_registry().inc('portfolio_fragment_cache_total', dict(labels, result='hit'))
+        return mark_safe(cached[1])
+
+    html = render()
+    renderings[source] = (stamp, str(html))
+    cache.set(key, renderings, timeout)
+    get_registry().inc('portfolio_fragment_cache_total', dict(labels, result='miss'))
+    return html
@@ -0,0 +1,232 @@
+from django.conf import settings
+from django.db import close_old_connections, DatabaseError
+from pathlib import Path
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+from .models import ContactMessage
+from .notifications import notify_new_messages
+
+logger = logging.getLogger(__name__)
+
+class ContactQueue:
+    """Bounded in-process write-behind queue for contact messages
+
+    Submissions are appended to a per-process spool file before they are
+    queued, and a daemon thread drains the queue into the database with
+    bulk_create. Message ids are assigned up front, so replaying a spool
+    file after a crash never creates duplicates. Spool names carry a random
+    token as well as the pid, since workers often get the same pids back
+    after a restart.
+    """
+
+    def __init__(self, spool_dir, max_size=1000, batch_size=50, flush_interval=1.0):
+        self.spool_dir = Path(spool_dir)
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pid = None
+        self.lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            'enqueued': 0,
+            'rejected': 0,
+            'flushed': 0,
+            'flushes': 0,
+            'flush_errors': 0,
+            'recovered': 0,
+            'last_flush_seconds': 0.0,
+            'total_flush_seconds': 0.0,
+        }
+
+    def start(self):
+        """Open the spool file and start the flusher in the current process"""
+        self.pid = os.getpid()
+        self.queue = queue.Queue(maxsize=self.max_size)
+        self.pending = []
+        self.stopping = threading.Event()
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.spool_path = self.spool_dir / f'contact-{self.pid}-{uuid.uuid4().hex[:12]}.jsonl'
+        self.spool = open(self.spool_path, 'x', encoding='utf-8')
+        if fcntl:
+            fcntl.flock(self.spool, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self.thread = threading.Thread(target=self.run, name='contact-queue-flusher', daemon=True)
+        self.thread.start()
+        atexit.register(self.stop)
+
+    def ensure_started(self):
+        # Start lazily so each forked gunicorn worker gets its own thread and spool
+        if self.pid != os.getpid():
+            with self.lock:
+                if self.pid != os.getpid():
+                    self.start()
+
+    def submit(self, fields):
+        """Queue a validated message; return False when the queue is full"""
+        self.ensure_started()
+        record = dict(fields, id=str(uuid.uuid4()))
+        with self.lock:
+            if self.queue.full():
+                self.count('rejected')
+                return False
+            self.spool.write(json.dumps(record) + '\n')
+            self.spool.flush()
+            os.fsync(self.spool.fileno())
+            self.queue.put_nowait(record)
+        self.count('enqueued')
+        return True
+
+    def count(self, name, value=1):
+        with self.stats_lock:
+            self.stats[name] += value
+
+    def run(self):
+        self.recover()
+        backoff = self.flush_interval
+        while not self.stopping.is_set():
+            if not self.pending:
+                try:
+                    self.pending.append(self.queue.get(timeout=self.flush_interval))
+                except queue.Empty:
+                    continue
+            while len(self.pending) < self.batch_size:
+                try:
+                    self.pending.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if self.flush():
+                backoff = self.flush_interval
+            else:
+                # Keep the batch and back off, e.g. while SQLite is locked
+                self.stopping.wait(backoff)
+                backoff = min(backoff * 2, 30)
+        close_old_connections()
+
+    def flush(self):
+        """Write the pending batch; return True on success"""
+        start = time.perf_counter()
+        try:
+            close_old_connections()
+            write_messages(self.pending)
+        except DatabaseError as e:
+            self.count('flush_errors')
+            logger.error(f"Error flushing {len(self.pending)} contact messages: {e}")
+            return False
+
+        elapsed = time.perf_counter() - start
+        with self.stats_lock:
+            self.stats['flushed'] += len(self.pending)
+            self.stats['flushes'] += 1
+            self.stats['last_flush_seconds'] = elapsed
+            self.stats['total_flush_seconds'] += elapsed
+        logger.debug(f"Flushed {len(self.pending)} contact messages in {elapsed * 1000:.1f}ms")
+        self.pending = []
+
+        with self.lock:
+            if self.queue.empty():
+                # Everything spooled is now in the database; rewind too, or the
+                # next append lands at the old offset after a run of NUL bytes
+                self.spool.seek(0)
+                self.spool.truncate(0)
+        return True
+
+    def recover(self):
+        """Replay spool files left behind by workers that are no longer running"""
+        for path in self.spool_dir.glob('contact-*.jsonl'):
+            if path == self.spool_path:
+                continue
+            try:
+                with open(path, 'r+', encoding='utf-8') as spool:
+                    if fcntl:
+                        fcntl.flock(spool, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    records = []
+                    for number, line in enumerate(spool, 1):
+                        # Spools written before flush rewound the file start with NULs
+                        line = line.lstrip('\x00').strip()
+                        if not line:
+                            continue
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError as e:
+                            logger.error(f"Error reading line {number} of contact spool {path.name}: {e}")
+                    if records:
+                        close_old_connections()
+                        write_messages(records)
+                        self.count('recovered', len(records))
+                        logger.info(f"Recovered {len(records)} contact messages from {path.name}")
+                path.unlink()
+            except BlockingIOError:
+                continue  # Owned by a live worker
+            except (OSError, ValueError, DatabaseError) as e:
+                logger.error(f"Error recovering contact spool {path.name}: {e}")
+
+    def stop(self):
+        """Flush what is left before the process exits"""
+        if self.pid != os.getpid():
+            return
+        self.stopping.set()
+        self.thread.join(timeout=5)
+        while True:
+            try:
+                self.pending.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if self.pending:
+            self.flush()
+
+    def get_metrics(self):
+        """Return queue depth and flush statistics"""
+        with self.stats_lock:
+            metrics = dict(self.stats)
+        metrics['depth'] = self.queue.qsize() if self.pid == os.getpid() else 0
+        metrics['avg_flush_seconds'] = (
+            metrics['total_flush_seconds'] / metrics['flushes'] if metrics['flushes'] else 0.0
+        )
+        return metrics
+
+def write_messages(records):
+    """Insert spooled records, skipping ids that are already stored
+
+    Only rows inserted here are notified, so a replayed spool does not
+    email the owner twice.
+    """
+    messages = [ContactMessage(**record) for record in records]
+    ids = [record['id'] for record in records]
+    stored = {str(pk) for pk in ContactMessage.objects.filter(id__in=ids).values_list('id', flat=True)}
+    messages = [message for message in messages if str(message.id) not in stored]
+    ContactMessage.objects.bulk_create(messages, ignore_conflicts=True)
+    notify_new_messages(messages)
+
+_contact_queue = None
+
+def start_contact_queue():
+    """Start this worker's queue now, replaying spools left by earlier workers
+
+    Called when a worker boots; otherwise those messages would wait for the
+    worker's first submission.
+    """
+    if settings.CONTACT_WRITE_BEHIND:
+        get_contact_queue().ensure_started()
+
+def get_contact_queue():
+    """Return the process-wide contact queue"""
+    global _contact_queue
+    if _contact_queue is None:
+        _contact_queue = ContactQueue(
+            spool_dir=settings.CONTACT_QUEUE_SPOOL_DIR,
+            max_size=settings.CONTACT_QUEUE_MAX_SIZE,
+            batch_size=settings.CONTACT_QUEUE_BATCH_SIZE,
+            flush_interval=settings.CONTACT_QUEUE_FLUSH_INTERVAL,
+        )
+    return _contact_queue
@@ -0,0 +1,49 @@
+from django.utils.functional import SimpleLazyObject
+from .cache import ProcessLocal
+from .models import About
+
+ABOUT_VERSION_KEY = 'main:about_version'
+
+class Owner:
+    """The About row with the values derived from it, shared by every request"""
+
+    def __init__(self, about):
+        self.about = about
+        if about is not None:
+            # Parse now; the shared instance is read from many threads
+            about.get_skills_list()
+        self.social_links = about.get_social_links() if about is not None else {}
+
+def load_owner():
+    return Owner(About.objects.first())
+
+_owner = ProcessLocal(ABOUT_VERSION_KEY, load_owner)
+
+def get_about():
+    """The stored About, or None; cached in process memory
+
+    The instance is shared between requests, so callers must not modify it.
+    """
+    return _owner.get().about
+
+async def aget_about():
+    """Async counterpart of get_about; call it before rendering pages"""
+    return (await _owner.aget()).about
+
+def get_social_links():
+    return _owner.get().social_links
+
+def invalidate_about():
+    """Make every process reload About"""
+    _owner.invalidate()
+
+def owner(request):
+    """Template context processor adding the site owner's About and social links
+
+    Pages that never show them do not load them. Without a stored About an
+    unsaved one with the model defaults is used, so reads never write.
+    """
+    return {
+        'about': SimpleLazyObject(lambda: get_about() or About()),
+        'social_links': SimpleLazyObject(get_social_links),
+    }
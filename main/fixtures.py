@@ -0,0 +1,139 @@
+from django.core import serializers
+from django.db import transaction
+from .cache import bump_content_version
+from .context_processors import invalidate_about
+from .icons import invalidate_icon_matcher
+from .models import About, Experience, Project, ContactMessage, Skill, MarkdownFieldsMixin, sync_technologies_bulk
+from .related import update_related_projects
+from .search import get_search_backend
+from .sitemap_files import build_sitemaps, sitemaps_built
+
+# Export order; technologies and related projects are derived and rebuilt on import
+CONTENT_MODELS = [About, Skill, Experience, Project, ContactMessage]
+
+# Models upserted directly on a unique column
+UNIQUE_FIELDS = {
+    Skill: ('name',),
+    Project: ('slug',),
+    ContactMessage: ('id',),
+}
+# Models without a unique natural key in the schema: existing ids are looked
+# up by these fields first, then rows are upserted on the primary key.
+# About is a singleton, so its empty key matches whichever row exists.
+NATURAL_KEYS = {
+    About: (),
+    Experience: ('title', 'company_or_institution'),
+}
+
+def get_content_model(label):
+    """Return the content model for a name such as 'project' or 'main.project'"""
+    name = label.rsplit('.', 1)[-1].lower()
+    for model in CONTENT_MODELS:
+        if model._meta.model_name == name:
+            return model
+    raise LookupError(f'Unknown content model: {label}')
+
+def rendered_fields(model):
+    """Companion fields holding HTML rendered from markdown; rebuilt on import"""
+    return [f'{name}_html' for name in getattr(model, 'markdown_fields', ())]
+
+def variant_fields(model):
+    """Lists of resized image copies; kept on update, made by generate_image_variants"""
+    return [f'{name}_variants' for name in getattr(model, 'image_fields', ())]
+
+def exported_fields(model):
+    derived = rendered_fields(model) + variant_fields(model)
+    return [
+        field.name for field in model._meta.concrete_fields
+        if not field.primary_key and field.name not in derived
+    ]
+
+def export_content(stream, models=None, chunk_size=1000):
+    """Write models as JSON Lines to stream; return {model: rows written}"""
+    counts = {}
+    for model in models or CONTENT_MODELS:
+        counts[model] = 0
+
+        def rows(model=model):
+            for obj in model.objects.all().iterator(chunk_size=chunk_size):
+                counts[model] += 1
+                yield obj
+
+        serializers.serialize('jsonl', rows(), stream=stream, fields=exported_fields(model))
+    return counts
+
+def _key(model, obj):
+    fields = UNIQUE_FIELDS.get(model) or NATURAL_KEYS[model]
+    return tuple(getattr(obj, field) for field in fields)
+
+def _resolve_ids(model, objects):
+    """Point objects at existing rows that share their natural key"""
+    fields = NATURAL_KEYS[model]
+    queryset = model.objects.all()
+    if fields:
+        queryset = queryset.filter(**{f'{fields[0]}__in': {getattr(obj, fields[0]) for obj in objects}})
+    existing = {tuple(row[:-1]): row[-1] for row in queryset.values_list(*fields, 'pk')}
+    for obj in objects:
+        obj.pk = existing.get(_key(model, obj), obj.pk)
+
+def upsert(model, objects, related=True):
+    """Insert or update one batch of deserialized objects; return the row count"""
+    # The same key twice in one statement is an error on PostgreSQL; last one wins
+    objects = list({_key(model, obj): obj for obj in objects}.values())
+    if model in NATURAL_KEYS:
+        _resolve_ids(model, objects)
+        unique_fields = ['pk']
+    else:
+        unique_fields = list(UNIQUE_FIELDS[model])
+    update_fields = [
+        name for name in exported_fields(model)
+        if name not in unique_fields and name != 'created_at'
+    ] + rendered_fields(model)
+    for obj in objects:
+        if isinstance(obj, MarkdownFieldsMixin):
+            obj.render_markdown_fields()
+
+    with transaction.atomic():
+        model.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=update_fields,
+        )
+        if model is Project:
+            # Conflicting rows keep their own ids, so reload what was written
+            projects = list(Project.objects.filter(slug__in=[obj.slug for obj in objects]))
+            sync_technologies_bulk(projects)
+            get_search_backend().index_projects(projects)
+            if related:
+                for project in projects:
+                    update_related_projects(project)
+    return len(objects)
+
+def import_content(stream, batch_size=500, related=True):
+    """Upsert JSON Lines content from stream; return {model: rows upserted}"""
+    counts = {}
+    batch, batch_model = [], None
+    for deserialized in serializers.deserialize('jsonl', stream, ignorenonexistent=True):
+        obj = deserialized.object
+        model = type(obj)
+        if model not in CONTENT_MODELS:
+            raise ValueError(f'{model._meta.label} is not importable content')
+        if batch and (model is not batch_model or len(batch) >= batch_size):
+            counts[batch_model] = counts.get(batch_model, 0) + upsert(batch_model, batch, related)
+            batch = []
+        batch_model = model
+        batch.append(obj)
+    if batch:
+        counts[batch_model] = counts.get(batch_model, 0) + upsert(batch_model, batch, related)
+
+    if counts:
+        # Bulk writes skip the signals that normally invalidate cached pages
+        bump_content_version()
+    if Project in counts and sitemaps_built():
+        build_sitemaps()
+    if About in counts:
+        invalidate_about()
+    if Skill in counts:
+        invalidate_icon_matcher()
+    return counts
@@ -0,0 +1,213 @@
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.db import DatabaseError
+from django.template import engines
+from pathlib import Path
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+FONTS_CSS = 'fonts/fonts.css'
+
+# Font Awesome style classes and the webfont each one draws from
+ICON_STYLES = {
+    'fas': 'solid', 'fa-solid': 'solid',
+    'far': 'regular', 'fa-regular': 'regular',
+    'fab': 'brands', 'fa-brands': 'brands',
+}
+ICON_FONTS = {
+    'solid': ('Font Awesome 6 Free', 900, 'fa-solid-900'),
+    'regular': ('Font Awesome 6 Free', 400, 'fa-regular-400'),
+    'brands': ('Font Awesome 6 Brands', 400, 'fa-brands-400'),
+}
+
+# Text fonts we host, with their vendored variable font; each weight the
+# site uses is cut from it as a static instance
+TEXT_FONTS = {
+    'JetBrains Mono': ('jetbrains-mono', 'jetbrains-mono/JetBrainsMono[wght].ttf'),
+}
+WEIGHT_KEYWORDS = {'normal': 400, 'bold': 700}
+# Printable Latin-1 plus dashes, quotes, bullet, ellipsis and the euro sign
+TEXT_UNICODES = sorted({
+    *range(0x20, 0x7f), *range(0xa0, 0x100),
+    0x2013, 0x2014, 0x2018, 0x2019, 0x201c, 0x201d, 0x2022, 0x2026, 0x20ac,
+})
+
+# Python and template files that name icon classes
+ICON_SOURCE_MODULES = ['main/icons.py', 'main/templatetags/portfolio_extras.py']
+ICON_CLASS = re.compile(r'\b(fa[srb]|fa-solid|fa-regular|fa-brands)\s+fa-([a-z0-9-]+)')
+# '.fa-house::before, .fa-home::before { content: "\f015"; }' and the
+# newer '.fa-house { --fa: "\f015"; }'
+ICON_RULE = re.compile(
+    r'((?:\.fa-[a-z0-9-]+(?:::?before)?\s*,?\s*)+)\{\s*(?:content|--fa)\s*:\s*"\\([0-9a-fA-F]+)"'
+)
+CSS_RULE = re.compile(r'([^{}]*)\{([^{}]*)\}')
+FONT_FAMILY = re.compile(r'font-family\s*:\s*([^;}]+)')
+FONT_WEIGHT = re.compile(r'font-weight\s*:\s*([^;}]+)')
+
+def font_source_dir():
+    return Path(settings.FONT_SOURCE_DIR)
+
+def font_output_dir():
+    return Path(settings.STATICFILES_DIRS[0]) / Path(FONTS_CSS).parent
+
+def web_fonts_built():
+    """Whether the self-hosted fonts can be served
+
+    Asks the storage that serves static files, so in production the CDN
+    links stay until collectstatic has copied fonts.css to STATIC_ROOT;
+    with DEBUG the finders serve straight from static/. Checked on every
+    call, at the cost of one stat(), so running workers switch over as soon
+    as the fonts are in place.
+    """
+    if settings.DEBUG:
+        return finders.find(FONTS_CSS) is not None
+    return staticfiles_storage.exists(FONTS_CSS)
+
+def _template_files():
+    for backend in engines.all():
+        for directory in getattr(backend, 'template_dirs', ()):
+            directory = Path(directory)
+            if directory.is_dir() and directory.is_relative_to(settings.BASE_DIR):
+                yield from sorted(path for path in directory.rglob('*') if path.is_file())
+
+def _stylesheets():
+    for root in settings.STATICFILES_DIRS:
+        root = Path(root[1] if isinstance(root, (list, tuple)) else root)
+        yield from sorted(path for path in root.rglob('*.css') if path != root / FONTS_CSS)
+
+def used_icons():
+    """(style, name) of every icon named in the templates, the icon maps and the admin"""
+    texts = [path.read_text(encoding='utf-8') for path in _template_files()]
+    texts += [(Path(settings.BASE_DIR) / module).read_text(encoding='utf-8') for module in ICON_SOURCE_MODULES]
+    try:
+        from .models import Skill
+        texts += list(Skill.objects.exclude(icon_class='').values_list('icon_class', flat=True))
+    except DatabaseError as e:
+        logger.warning(f"Skipping icons set in the admin: {e}")
+    icons = set()
+    for text in texts:
+        for style, name in ICON_CLASS.findall(text):
+            icons.add((ICON_STYLES[style], name))
+    return icons
+
+def used_weights():
+    """{family: weights} of the hosted text fonts named by a font-family rule"""
+    texts = [path.read_text(encoding='utf-8') for path in _stylesheets()]
+    texts += [path.read_text(encoding='utf-8') for path in _template_files() if path.suffix == '.html']
+    weights = {}
+    for text in texts:
+        for _, body in CSS_RULE.findall(text):
+            family = FONT_FAMILY.search(body)
+            if not family:
+                continue
+            primary = family.group(1).split(',')[0].strip().strip('"\'')
+            if primary not in TEXT_FONTS:
+                continue
+            weight = FONT_WEIGHT.search(body)
+            weight = weight.group(1).strip() if weight else 'normal'
+            weights.setdefault(primary, set()).add(WEIGHT_KEYWORDS.get(weight) or int(weight))
+    return weights
+
+def icon_codepoints(stylesheet):
+    """{icon name: codepoint} from Font Awesome's own all.css"""
+    codepoints = {}
+    for selectors, codepoint in ICON_RULE.findall(stylesheet):
+        for name in re.findall(r'\.fa-([a-z0-9-]+)', selectors):
+            codepoints[name] = int(codepoint, 16)
+    return codepoints
+
+def subset_font(source, target, unicodes, weight=None):
+    """Write the glyphs of source that cover unicodes to target as WOFF2; return its size
+
+    A weight pins a variable source to that one instance first.
+    """
+    from fontTools import subset
+    from fontTools.varLib import instancer
+
+    # It reports every table it touches at INFO
+    logging.getLogger('fontTools').setLevel(logging.WARNING)
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.name_IDs = []
+    font = subset.load_font(str(source), options)
+    if weight is not None and 'fvar' in font:
+        font = instancer.instantiateVariableFont(font, {'wght': weight}, updateFontNames=False)
+    missing = set(unicodes) - set(font.getBestCmap())
+    if missing:
+        logger.warning(f"{source.name} has no glyph for {', '.join(f'U+{c:04X}' for c in sorted(missing))}")
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=unicodes)
+    subsetter.subset(font)
+    subset.save_font(font, str(target), options)
+    return target.stat().st_size
+
+def _unicode_range(codepoints):
+    """Collapse sorted codepoints into a CSS unicode-range value"""
+    ranges, start = [], None
+    for index, codepoint in enumerate(codepoints):
+        if start is None:
+            start = codepoint
+        if index + 1 == len(codepoints) or codepoints[index + 1] != codepoint + 1:
+            ranges.append(f'U+{start:04X}' if start == codepoint else f'U+{start:04X}-{codepoint:04X}')
+            start = None
+    return ','.join(ranges)
+
+def _font_face(family, weight, filename, display, unicode_range=None):
+    rule = (f'@font-face{{font-family:"{family}";font-style:normal;font-weight:{weight};'
+            f'font-display:{display};src:url({filename}) format("woff2")')
+    if unicode_range:
+        rule += f';unicode-range:{unicode_range}'
+    return rule + '}'
+
+def build_fonts(extra_icons=()):
+    """Subset the vendored fonts to what the site uses; return {file: bytes}
+
+    Writes WOFF2 files and fonts.css into static/fonts, where collectstatic
+    picks them up. Reads only from FONT_SOURCE_DIR, so it needs no network.
+    """
+    source, output = font_source_dir(), font_output_dir()
+    stylesheet = source / 'fontawesome' / 'all.css'
+    if not stylesheet.exists():
+        raise FileNotFoundError(f'Font Awesome stylesheet not found at {stylesheet}')
+    codepoints = icon_codepoints(stylesheet.read_text(encoding='utf-8'))
+
+    icons = used_icons() | set(extra_icons)
+    by_style = {}
+    for style, name in sorted(icons):
+        if name not in codepoints:
+            logger.warning(f"Unknown icon fa-{name}; it will not render")
+            continue
+        by_style.setdefault(style, {})[name] = codepoints[name]
+
+    output.mkdir(parents=True, exist_ok=True)
+    for stale in output.glob('*.woff2'):
+        stale.unlink()
+    sizes, css = {}, ['/* Generated by manage.py build_fonts; do not edit */']
+    for style, names in sorted(by_style.items()):
+        family, weight, filename = ICON_FONTS[style]
+        target = output / f'{filename}.woff2'
+        sizes[target.name] = subset_font(source / 'fontawesome' / f'{filename}.ttf', target,
+                                         sorted(set(names.values())))
+        css.append(_font_face(family, weight, target.name, 'block'))
+        classes = ','.join(f'.{name}' for name, value in ICON_STYLES.items() if value == style)
+        css.append(f'{classes}{{font-family:"{family}";font-weight:{weight}}}')
+    if by_style:
+        classes = ','.join(f'.{name}' for name in ICON_STYLES)
+        css.append(f'{classes}{{-moz-osx-font-smoothing:grayscale;-webkit-font-smoothing:antialiased;'
+                   'display:inline-block;font-style:normal;font-variant:normal;line-height:1;text-rendering:auto}')
+    for names in by_style.values():
+        for name, codepoint in sorted(names.items()):
+            css.append(f'.fa-{name}:before{{content:"\\{codepoint:x}"}}')
+
+    for family, weights in sorted(used_weights().items()):
+        slug, pattern = TEXT_FONTS[family]
+        for weight in sorted(weights):
+            target = output / f'{slug}-{weight}.woff2'
+            sizes[target.name] = subset_font(source / pattern, target, TEXT_UNICODES, weight)
+            css.append(_font_face(family, weight, target.name, 'swap', _unicode_range(TEXT_UNICODES)))
+
+    (output / Path(FONTS_CSS).name).write_text('\n'.join(css) + '\n', encoding='utf-8')
+    return sizes
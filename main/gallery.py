@@ -0,0 +1,140 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction, DatabaseError
+from django.dispatch import Signal
+from PIL import Image, ImageOps
+from urllib.parse import unquote, urlsplit
+from .images import get_executor
+from .models import GalleryImage
+import base64
+import io
+import logging
+import posixpath
+
+logger = logging.getLogger(__name__)
+
+# Longest side of the placeholder; browsers blur it when scaling it up
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+
+# Sent with sender=GalleryImage and project_ids once sizes are recorded
+gallery_measured = Signal()
+
+def local_media_name(url):
+    """Storage name of a gallery entry that points into our own media, else None
+
+    Bare names ('gallery/shot.png'), MEDIA_URL paths and SITE_URL links
+    count as local. Other hosts are never fetched.
+    """
+    parsed = urlsplit(url.strip())
+    if parsed.scheme or parsed.netloc:
+        if parsed.netloc != urlsplit(settings.SITE_URL).netloc:
+            return None
+    path = unquote(parsed.path)
+    if path.startswith(settings.MEDIA_URL):
+        path = path[len(settings.MEDIA_URL):]
+    elif path.startswith('/'):
+        return None
+    name = posixpath.normpath(path)
+    if name.startswith('..') or name in ('', '.'):
+        return None
+    return name
+
+def describe_image(name):
+    """(width, height, placeholder data URI) of a stored image"""
+    with default_storage.open(name) as stored:
+        image = Image.open(stored)
+        width, height = image.size
+        if image.getexif().get(0x0112, 1) > 4:
+            # Turned a quarter turn by its EXIF orientation
+            width, height = height, width
+        # JPEGs decode straight to a fraction of their size
+        image.draft('RGB', (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+        image = ImageOps.exif_transpose(image)
+    image.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, 'WEBP', quality=PLACEHOLDER_QUALITY)
+    return width, height, 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+def sync_gallery(project):
+    """Match the project's gallery rows to its gallery_images; return rows still to measure
+
+    New entries get rows, removed ones lose theirs and the rest are
+    reordered. Entries already measured are never read again.
+    """
+    urls = list(dict.fromkeys(project.get_gallery_images()))
+    rows = {row.url: row for row in GalleryImage.objects.filter(project=project)}
+    stale = [row.pk for url, row in rows.items() if url not in urls]
+    if stale:
+        GalleryImage.objects.filter(pk__in=stale).delete()
+    created, moved = [], []
+    for order, url in enumerate(urls):
+        row = rows.get(url)
+        if row is None:
+            created.append(GalleryImage(project=project, url=url, order=order))
+        elif row.order != order:
+            row.order = order
+            moved.append(row)
+    GalleryImage.objects.bulk_create(created)
+    GalleryImage.objects.bulk_update(moved, ['order'])
+    return [
+        row.pk for row in [*created, *rows.values()]
+        if row.url in urls and row.width is None and local_media_name(row.url)
+    ]
+
+def measure_images(pks, force=False):
+    """Record the size and placeholder of local gallery images; return how many were measured"""
+    rows = list(GalleryImage.objects.filter(pk__in=pks))
+    measured = []
+    for row in rows:
+        if row.width is not None and not force:
+            continue
+        name = local_media_name(row.url)
+        if not name:
+            continue
+        try:
+            row.width, row.height, row.placeholder = describe_image(name)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            logger.error(f"Error measuring gallery image {row.url}: {e}")
+            continue
+        measured.append(row)
+    GalleryImage.objects.bulk_update(measured, ['width', 'height', 'placeholder'])
+    if measured:
+        gallery_measured.send(sender=GalleryImage, project_ids={row.project_id for row in measured})
+    return len(measured)
+
+def _measure_in_background(pks):
+    try:
+        close_old_connections()
+        measure_images(pks)
+    except DatabaseError as e:
+        logger.error(f"Error storing gallery image sizes: {e}")
+    finally:
+        close_old_connections()
+
+def schedule_gallery_sync(project):
+    """Sync the project's gallery rows, then measure new images once the transaction commits"""
+    pending = sync_gallery(project)
+    if pending:
+        transaction.on_commit(lambda: get_executor().submit(_measure_in_background, pending))
+
+def _gallery(project, rows):
+    """One item per gallery_images entry, in order; entries without a row get an unsaved one"""
+    by_url = {row.url: row for row in rows}
+    return [
+        by_url.get(url) or GalleryImage(project=project, url=url, order=order)
+        for order, url in enumerate(dict.fromkeys(project.get_gallery_images()))
+    ]
+
+def load_gallery(project):
+    """Gallery items for the detail page; no query when the project has none"""
+    if not project.get_gallery_images():
+        return []
+    return _gallery(project, GalleryImage.objects.filter(project=project))
+
+async def aload_gallery(project):
+    """Async counterpart of load_gallery"""
+    if not project.get_gallery_images():
+        return []
+    return _gallery(project, [row async for row in GalleryImage.objects.filter(project=project)])
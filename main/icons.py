@@ -0,0 +1,97 @@
+from django.db.models import Q
+from .cache import ProcessLocal
+from .models import Skill
+import re
+
+DEFAULT_ICON = 'fas fa-code'
+
+SKILL_ICONS = {
+    'python': 'fab fa-python',
+    'django': 'fas fa-server',
+    'tensorflow': 'fas fa-brain',
+    'ai': 'fas fa-brain',
+    'ml': 'fas fa-brain',
+    'machine learning': 'fas fa-brain',
+    'docker': 'fab fa-docker',
+    'git': 'fab fa-git-alt',
+    'github': 'fab fa-github',
+    'postgresql': 'fas fa-database',
+    'database': 'fas fa-database',
+    'telegram': 'fas fa-robot',
+    'bot': 'fas fa-robot',
+    'api': 'fas fa-plug',
+    'rest': 'fas fa-plug',
+    'javascript': 'fab fa-js',
+    'html': 'fab fa-html5',
+    'css': 'fab fa-css3-alt',
+    'react': 'fab fa-react',
+    'node': 'fab fa-node-js',
+    'linux': 'fab fa-linux',
+    'aws': 'fab fa-aws',
+    'redis': 'fas fa-memory',
+    'celery': 'fas fa-tasks',
+}
+
+ICONS_VERSION_KEY = 'main:skill_icons_version'
+MEMO_SIZE = 4096
+
+# Longest keywords first, so at any position the longest one matches
+SKILL_ICON_PATTERN = re.compile('|'.join(
+    re.escape(key) for key in sorted(SKILL_ICONS, key=len, reverse=True)
+))
+
+def match_keyword(key):
+    """Icon of the leftmost, longest built-in keyword in a lowercased skill"""
+    found = SKILL_ICON_PATTERN.search(key)
+    return SKILL_ICONS[found.group()] if found else DEFAULT_ICON
+
+class IconMatcher:
+    """Maps skill strings to (icon class, color), memoizing every answer
+
+    Skills configured in the admin match by exact, case-insensitive name
+    and win over the built-in map. Anything else takes the leftmost,
+    longest built-in keyword found in it, so 'HTML' gets the HTML icon
+    rather than the one for 'ML'.
+    """
+
+    def __init__(self, configured=()):
+        self.exact = {}
+        for name, icon_class, color in configured:
+            key = name.strip().lower()
+            self.exact[key] = (icon_class or match_keyword(key), color)
+        self.memo = {}
+
+    def match(self, skill):
+        """Return (icon class, color) for a skill string"""
+        entry = self.memo.get(skill)
+        if entry is None:
+            key = str(skill).strip().lower()
+            entry = self.exact.get(key) or (match_keyword(key), '')
+            if len(self.memo) >= MEMO_SIZE:
+                self.memo.clear()
+            self.memo[skill] = entry
+        return entry
+
+def load_icon_matcher():
+    configured = Skill.objects.filter(~Q(icon_class='') | ~Q(color='')).values_list(
+        'name', 'icon_class', 'color'
+    )
+    return IconMatcher(list(configured))
+
+_matcher = ProcessLocal(ICONS_VERSION_KEY, load_icon_matcher)
+
+def get_icon_matcher():
+    """Return this process's matcher, rebuilt after any skill changed"""
+    return _matcher.get()
+
+async def aget_icon_matcher():
+    """Async counterpart of get_icon_matcher; call it before rendering skills"""
+    return await _matcher.aget()
+
+def invalidate_icon_matcher():
+    """Make every process rebuild its matcher"""
+    _matcher.invalidate()
+
+def match_skill(skill):
+    """(icon class, color) for a skill string; color is '' unless set in the admin"""
+    return get_icon_matcher().match(skill)
@@ -0,0 +1,190 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction, DatabaseError
+from django.db.models import Q
+from django.dispatch import Signal
+from django.utils.html import format_html, format_html_join
+from hashlib import md5
+from pathlib import PurePosixPath
+from PIL import Image, ImageOps
+import io
+import logging
+import math
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = 'variants'
+# Best first; browsers take the first <source> type they support
+VARIANT_FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', {'optimize': True, 'progressive': True}),
+}
+FALLBACK_FORMAT = 'jpeg'
+
+# Sent with sender=<model>, pk and field once new copies are stored
+variants_ready = Signal()
+
+def _variant_name(source, width, extension):
+    """Storage name of one copy
+
+    The token changes with the source name and the quality setting, so a
+    copy is never overwritten with different bytes under the same URL.
+    """
+    path = PurePosixPath(source)
+    token = md5(f'{source}|{settings.IMAGE_VARIANT_QUALITY}'.encode('utf-8')).hexdigest()[:8]
+    return f'{VARIANTS_DIR}/{path.parent}/{path.stem}.{token}-{width}.{extension}'
+
+def _target_widths(width):
+    """The configured widths narrower than the image, plus its own width capped at the largest"""
+    widths = sorted(w for w in settings.IMAGE_VARIANT_WIDTHS if w < width)
+    full = min(width, max(settings.IMAGE_VARIANT_WIDTHS))
+    if full not in widths:
+        widths.append(full)
+    return widths
+
+def generate_variants(source):
+    """Write resized WebP and JPEG copies of a stored image; return their metadata
+
+    Needs no database, so it can run in a thread or a worker process.
+    The result is what <field>_variants stores:
+    {'source', 'width', 'height', 'bytes', <format>: [[width, height, name], ...]}.
+    """
+    with default_storage.open(source) as stored:
+        image = Image.open(stored)
+        raw_width, raw_height = image.size
+        # Orientations 5-8 turn the image a quarter turn
+        rotated = image.getexif().get(0x0112, 1) > 4
+        width, height = (raw_height, raw_width) if rotated else (raw_width, raw_height)
+        widths = _target_widths(width)
+        # JPEG decoding can scale down by powers of two for free
+        scale = widths[-1] / width
+        image.draft('RGB', (math.ceil(raw_width * scale), math.ceil(raw_height * scale)))
+        image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        flat = Image.new('RGB', image.size, (255, 255, 255))
+        flat.paste(image, mask=image.getchannel('A'))
+        image = flat
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    result = {'source': source, 'width': width, 'height': height, 'bytes': default_storage.size(source)}
+    for extension in VARIANT_FORMATS:
+        result[extension] = []
+    for target in reversed(widths):
+        # Each copy is resized from the next larger one, which is much cheaper
+        # than going back to the original and looks the same
+        size = (target, max(1, round(height * target / width)))
+        image = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0) if image.size != size else image
+        for extension, (image_format, _, options) in VARIANT_FORMATS.items():
+            buffer = io.BytesIO()
+            image.save(buffer, image_format, quality=settings.IMAGE_VARIANT_QUALITY, **options)
+            name = _variant_name(source, target, extension)
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            name = default_storage.save(name, ContentFile(buffer.getvalue()))
+            result[extension].insert(0, [size[0], size[1], name])
+    return result
+
+def variant_files(variants):
+    return [entry[2] for extension in VARIANT_FORMATS for entry in (variants or {}).get(extension, ())]
+
+def delete_variant_files(names):
+    for name in names:
+        try:
+            default_storage.delete(name)
+        except OSError as e:
+            logger.error(f"Error deleting image variant {name}: {e}")
+
+def store_variants(model, pk, field, variants, previous=None):
+    """Save generated variants if the row still shows their source; return True if saved
+
+    Old copies are removed, and variants_ready is sent so cached pages
+    pick up the new markup.
+    """
+    saved = model.objects.filter(pk=pk, **{field: variants['source']}).update(**{f'{field}_variants': variants})
+    if not saved:
+        # The image was replaced or the row deleted meanwhile
+        delete_variant_files(variant_files(variants))
+        return False
+    keep = set(variant_files(variants))
+    delete_variant_files(name for name in variant_files(previous) if name not in keep)
+    variants_ready.send(sender=model, pk=pk, field=field)
+    return True
+
+def refresh_variants(model, pk, field):
+    """Generate and store the copies of one row's image, or drop them if it has none"""
+    row = model.objects.filter(pk=pk).values_list(field, f'{field}_variants').first()
+    if not row:
+        return False
+    source, previous = row
+    if not source:
+        cleared = Q(**{field: ''}) | Q(**{f'{field}__isnull': True})
+        if previous and model.objects.filter(cleared, pk=pk).update(**{f'{field}_variants': {}}):
+            delete_variant_files(variant_files(previous))
+        return False
+    try:
+        variants = generate_variants(source)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.error(f"Error resizing {source}: {e}")
+        return False
+    return store_variants(model, pk, field, variants, previous)
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """This process's image worker threads, started on first use after a fork"""
+    global _executor, _executor_pid
+    if _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.IMAGE_VARIANT_WORKERS, thread_name_prefix='image-variants'
+                )
+                _executor_pid = os.getpid()
+    return _executor
+
+def _refresh_in_background(model, pk, field):
+    try:
+        close_old_connections()
+        refresh_variants(model, pk, field)
+    except DatabaseError as e:
+        logger.error(f"Error storing image variants of {model._meta.label} {pk}: {e}")
+    finally:
+        close_old_connections()
+
+def schedule_variants(instance, field):
+    """Make the copies of instance's image in the background once the transaction commits"""
+    model, pk = type(instance), instance.pk
+    transaction.on_commit(lambda: get_executor().submit(_refresh_in_background, model, pk, field))
+
+def _srcset(entries):
+    return ', '.join(f'{default_storage.url(name)} {width}w' for width, _, name in entries)
+
+def picture_html(image, variants, sizes='100vw', alt=''):
+    """<picture> markup with a srcset per format, or a plain <img> until copies exist
+
+    The <img> carries the intrinsic width and height so the page keeps its
+    layout while the image loads.
+    """
+    if not image:
+        return ''
+    if not variants or variants.get('source') != image.name:
+        return format_html('<img src="{}" alt="{}" loading="lazy" decoding="async">', image.url, alt)
+    fallback = variants[FALLBACK_FORMAT]
+    sources = format_html_join('', '<source type="{}" srcset="{}" sizes="{}">', (
+        (VARIANT_FORMATS[extension][1], _srcset(variants[extension]), sizes)
+        for extension in VARIANT_FORMATS if extension != FALLBACK_FORMAT
+    ))
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" '
+        'loading="lazy" decoding="async"></picture>',
+        sources, default_storage.url(fallback[0][2]), _srcset(fallback), sizes,
+        variants['width'], variants['height'], alt,
+    )
@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand
+from django.utils.safestring import mark_safe
+from main.markup import highlight_code
+import random
+import re
+import statistics
+import time
+
+LINES = [
+    'def handle_update(update, context):',
+    '    """Reply to a message with the current price"""',
+    "    price = get_price(update.message.text, currency='USD')  # cached for 60 seconds",
+    '    if price is None:',
+    "        return context.bot.send_message(chat_id=update.effective_chat.id, text='Not found')",
+    '    for attempt in range(3):',
+    '        try:',
+    '            send(update, f"{price:.2f} USD", retries=attempt + 1)',
+    '            break',
+    '        except TimeoutError as error:',
+    '            logger.warning("retry %s after %r", attempt, error)',
+    '    return True',
+    'class PaymentGateway(BaseGateway):',
+    '    timeout = 30',
+    "    endpoints = {'create': '/v1/pay', 'status': '/v1/status'}",
+]
+
+# The filter as it was before the single-pass tokenizer, kept for comparison
+LEGACY_PATTERNS = [
+    (r'\b(def|class|import|from|if|else|elif|for|while|try|except|finally|with|as|return|yield|break|continue|pass|lambda|global|nonlocal)\b',
+     r'<span style="color: var(--terminal-blue);">\1</span>'),
+    (r'\b(True|False|None)\b',
+     r'<span style="color: var(--terminal-purple);">\1</span>'),
+    (r'(#.*$)',
+     r'<span style="color: var(--terminal-green);">\1</span>'),
+    (r'(["\'].*?["\'])',
+     r'<span style="color: var(--warning-color);">\1</span>'),
+    (r'\b(\d+)\b',
+     r'<span style="color: var(--terminal-orange);">\1</span>'),
+]
+
+def legacy_highlight_code(value):
+    result = str(value)
+    for pattern, replacement in LEGACY_PATTERNS:
+        result = re.sub(pattern, replacement, result, flags=re.MULTILINE)
+    return mark_safe(result)
+
+class Command(BaseCommand):
+    help = 'Compare the single-pass highlight_code tokenizer with the old multi-pass filter'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', default='100,1000,10000',
+                            help='Comma-separated snippet sizes in lines')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per snippet and implementation')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        self.stdout.write(f'{"lines":>7} {"legacy ms":>10} {"single ms":>10} {"cached ms":>10} {"speedup":>8}')
+        for size in (int(size) for size in options['lines'].split(',')):
+            code = '\n'.join(rng.choices(LINES, k=size))
+            legacy = self.measure(legacy_highlight_code, code, options['repeat'])
+            single = self.measure(highlight_code.__wrapped__, code, options['repeat'])
+            highlight_code(code)
+            cached = self.measure(highlight_code, code, options['repeat'])
+            self.stdout.write(f'{size:>7} {legacy:>10.2f} {single:>10.2f} {cached:>10.4f} '
+                              f'{legacy / single:>7.1f}x')
+
+    def measure(self, function, code, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(code)
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
@@ -0,0 +1,102 @@
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from main.notifications import NotificationDispatcher
+import socketserver
+import threading
+import time
+
+SMTP_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+class SinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept and discard messages"""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode('ascii'))
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply('220 localhost sink ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip().upper()
+            if command.startswith('EHLO'):
+                self.reply('250-localhost')
+                self.reply('250 8BITMIME')
+            elif command.startswith('DATA'):
+                self.reply('354 end data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                self.server.messages += 1
+                self.reply('250 OK')
+            elif command.startswith('QUIT'):
+                self.reply('221 bye')
+                return
+            else:
+                # HELO, MAIL, RCPT, RSET and NOOP
+                self.reply('250 OK')
+
+class SinkServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SinkHandler)
+        self.connections = 0
+        self.messages = 0
+
+class Command(BaseCommand):
+    help = 'Measure notification throughput against a local stand-in SMTP server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=500)
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=20)
+        parser.add_argument('--compare', action='store_true',
+                            help='Also time one connection per message, like a bare send_mail')
+
+    def handle(self, *args, **options):
+        server = SinkServer()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        connection_kwargs = {
+            'backend': SMTP_BACKEND,
+            'host': '127.0.0.1',
+            'port': server.server_address[1],
+            'username': '',
+            'password': '',
+            'use_tls': False,
+            'use_ssl': False,
+        }
+        count = options['messages']
+        messages = [
+            EmailMessage(f'Benchmark {i}', 'Body', 'noreply@example.com', ['owner@example.com'])
+            for i in range(count)
+        ]
+
+        if options['compare']:
+            start = time.perf_counter()
+            for message in messages:
+                with get_connection(**connection_kwargs) as connection:
+                    connection.send_messages([message])
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'per-message connections: {count / elapsed:,.0f} msg/s, '
+                              f'{server.connections} connections')
+            server.connections = 0
+
+        dispatcher = NotificationDispatcher(
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            connection_kwargs=connection_kwargs,
+        )
+        start = time.perf_counter()
+        for message in messages:
+            dispatcher.send(message)
+        dispatcher.stop(timeout=60)
+        elapsed = time.perf_counter() - start
+        metrics = dispatcher.get_metrics()
+        self.stdout.write(f'dispatcher: {count / elapsed:,.0f} msg/s end to end, '
+                          f'{metrics["throughput"]:,.0f} msg/s on the wire, '
+                          f'{metrics["connections_opened"]} connections, {metrics["batches"]} batches, '
+                          f'{metrics["failed"]} failed')
+        server.shutdown()
@@ -0,0 +1,97 @@
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import transaction
+from main.models import Project
+from main.search import get_search_backend, IcontainsSearchBackend
+import itertools
+import random
+import statistics
+import time
+import uuid
+
+WORDS = [
+    'telegram', 'bot', 'payment', 'gateway', 'machine', 'learning', 'pipeline', 'analytics',
+    'dashboard', 'scraper', 'recommendation', 'inventory', 'booking', 'chat', 'realtime',
+    'monitoring', 'classifier', 'vision', 'api', 'automation', 'ecommerce', 'crm', 'billing',
+    'search', 'notification', 'scheduler', 'portal', 'marketplace', 'forecast', 'translation',
+]
+FRAMEWORKS = [
+    'Python', 'Django', 'DRF', 'FastAPI', 'Flask', 'Aiogram', 'Telebot', 'TensorFlow', 'PyTorch',
+    'PostgreSQL', 'Redis', 'Celery', 'Docker', 'Kubernetes', 'React', 'Vue', 'Pandas', 'NumPy',
+]
+QUERIES = ['telegram', 'payment gateway', 'machine learn', 'django', 'redis', 'vision classifier']
+SYLLABLES = ['ka', 'lo', 'mi', 'ra', 'ten', 'vu', 'shi', 'por', 'den', 'qua', 'zel', 'nor']
+
+class Rollback(Exception):
+    pass
+
+class Command(BaseCommand):
+    help = 'Compare full-text search with the icontains filter at several catalog sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,100000',
+                            help='Comma-separated project counts to benchmark')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Runs per query and backend')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        self.rng = random.Random(options['seed'])
+        self.repeat = options['repeat']
+        # Filler vocabulary drawn with a long tail, so terms are as selective as in real text
+        filler = sorted({''.join(self.rng.choices(SYLLABLES, k=3)) for _ in range(3000)})
+        self.vocabulary = WORDS + filler
+        self.cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(self.vocabulary))))
+        backends = [
+            ('icontains', IcontainsSearchBackend()),
+            ('fulltext', get_search_backend()),
+        ]
+
+        self.stdout.write(f'{"projects":>9} {"backend":>10} {"mean ms":>9} {"p95 ms":>9}')
+        # Work inside a transaction that is rolled back so real data is untouched
+        try:
+            with transaction.atomic():
+                Project.objects.all().delete()
+                created = 0
+                for size in sizes:
+                    self.create_projects(size - created)
+                    created = size
+                    get_search_backend().rebuild(Project.objects.all())
+                    for name, backend in backends:
+                        timings = self.time_backend(backend)
+                        self.stdout.write(
+                            f'{size:>9} {name:>10} {statistics.mean(timings):>9.2f} '
+                            f'{statistics.quantiles(timings, n=20)[18]:>9.2f}'
+                        )
+                raise Rollback
+        except Rollback:
+            pass
+
+    def create_projects(self, count):
+        batch = []
+        for i in range(count):
+            title_words = self.rng.sample(WORDS, 3)
+            batch.append(Project(
+                id=uuid.uuid4(),
+                title=' '.join(title_words).title(),
+                slug=f'bench-{uuid.uuid4().hex}',
+                description=' '.join(self.rng.choices(self.vocabulary, cum_weights=self.cum_weights, k=40)),
+                frameworks=', '.join(self.rng.sample(FRAMEWORKS, 4)),
+            ))
+            if len(batch) >= 1000:
+                Project.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Project.objects.bulk_create(batch)
+
+    def time_backend(self, backend):
+        timings = []
+        for _ in range(self.repeat):
+            for query in QUERIES:
+                start = time.perf_counter()
+                # Count and fetch the first results page, as projects_view does
+                page = Paginator(backend.search(query, Project.objects.all()), 6).get_page(1)
+                list(page)
+                timings.append((time.perf_counter() - start) * 1000)
+        return timings
@@ -0,0 +1,155 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+import asyncio
+import itertools
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+SERVERS = {
+    'wsgi': ['-k', 'sync', 'portfolio.wsgi:application'],
+    'gthread': ['-k', 'gthread', '--threads', '8', 'portfolio.wsgi:application'],
+    'asgi': ['-k', 'uvicorn.workers.UvicornWorker', 'portfolio.asgi:application'],
+}
+DEFAULT_PATHS = ['/', '/projects/', '/projects/?search=python', '/api/projects/', '/api/skills/']
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response; return (status, keep_alive)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('connection closed')
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip().lower()
+
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    else:
+        await reader.read()
+        return status, False
+    return status, headers.get('connection') != 'close'
+
+async def client(port, paths, deadline, latencies, errors):
+    """Send requests on one keep-alive connection, reconnecting when closed"""
+    reader = writer = None
+    for path in itertools.cycle(paths):
+        if time.perf_counter() >= deadline:
+            break
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            start = time.perf_counter()
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode('ascii'))
+            status, keep_alive = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status >= 300 and status != 304:
+                errors.append(status)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            errors.append(e)
+            keep_alive = False
+        if not keep_alive and writer is not None:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+async def run_load(port, paths, concurrency, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        client(port, paths, deadline, latencies, errors) for _ in range(concurrency)
+    ))
+    return latencies, errors
+
+class Command(BaseCommand):
+    help = 'Load test the site under gunicorn sync workers and under uvicorn ASGI workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--servers', default='wsgi,asgi',
+                            help=f'Comma-separated servers to compare ({", ".join(SERVERS)})')
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--concurrency', type=int, default=200,
+                            help='Concurrent keep-alive client connections')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load per server')
+        parser.add_argument('--warmup', type=float, default=2.0)
+        parser.add_argument('--preload', action='store_true',
+                            help='Load and warm the app in the gunicorn master before forking workers')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Path to request (repeatable); defaults to the public pages')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or DEFAULT_PATHS
+        for name in options['servers'].split(','):
+            if name not in SERVERS:
+                raise CommandError(f'Unknown server {name!r}')
+            self.benchmark(name, paths, options)
+
+    def start_server(self, name, port, workers, preload=False):
+        command = [
+            sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}',
+            '--workers', str(workers), '--log-level', 'warning', *SERVERS[name],
+        ]
+        if preload:
+            command.insert(-1, '--preload')
+        env = dict(
+            os.environ,
+            DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'portfolio.settings'),
+            # Plain HTTP on loopback; HTTPS redirects would be all we measured
+            SECURE_SSL_REDIRECT='False',
+        )
+        if workers > 1 and not env.get('REDIS_URL'):
+            # Nothing is edited during the run, so per-worker caches cannot go stale
+            env['ALLOW_LOCAL_CACHE'] = 'True'
+        process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+        for _ in range(200):
+            if process.poll() is not None:
+                raise CommandError(f'{name} server exited with status {process.returncode}')
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+                return process
+            except OSError:
+                time.sleep(0.1)
+        process.terminate()
+        raise CommandError(f'{name} server did not start')
+
+    def benchmark(self, name, paths, options):
+        port = free_port()
+        process = self.start_server(name, port, options['workers'], options['preload'])
+        try:
+            if options['warmup']:
+                asyncio.run(run_load(port, paths, min(options['concurrency'], 10), options['warmup']))
+            latencies, errors = asyncio.run(
+                run_load(port, paths, options['concurrency'], options['duration'])
+            )
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+        if len(latencies) < 2:
+            self.stdout.write(f'{name:8} no successful requests, {len(errors)} errors')
+            return
+        cut = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f'{name:8} {len(latencies) / options["duration"]:8,.0f} req/s  '
+            f'p50 {cut[49] * 1000:7.1f} ms  p99 {cut[98] * 1000:7.1f} ms  '
+            f'{len(errors)} errors'
+        )
@@ -0,0 +1,219 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from main import urls as main_urls
+from main.models import About, Experience, Project, ContactMessage
+from main.related import recompute_neighbours
+from main.search import get_search_backend
+from main.synthetic import SyntheticData, bulk_insert
+from pathlib import Path
+import gc
+import json
+import statistics
+import time
+import uuid
+
+DETAIL_SAMPLE = 20
+
+# Most queries a request may run, whatever the row counts. A view that
+# goes over its budget has picked up an N+1 or a per-row lookup.
+QUERY_BUDGETS = {
+    'home': 1,
+    'about': 1,
+    'projects': 3,
+    'projects search': 4,
+    'projects last page': 3,
+    'project detail': 2,
+    'contact submit': 1,
+    'api projects': 3,
+    'api skills': 0,
+    'metrics': 0,
+    'sitemap': 2,
+}
+
+class Rollback(Exception):
+    pass
+
+class QueryCounter:
+    """Execute wrapper counting queries; unlike the debug log it never fills up"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+class Command(BaseCommand):
+    help = 'Measure view latency and SQL query counts as row counts grow'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100,10000,100000',
+                            help='Comma-separated row counts for projects, experiences and messages')
+        parser.add_argument('--requests', type=int, default=20, help='Requests per view and size')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--baseline', default=str(Path(settings.BASE_DIR) / 'benchmarks' / 'views.json'),
+                            help='JSON file with p95 latencies to compare against')
+        parser.add_argument('--save-baseline', action='store_true',
+                            help='Write this run to the baseline file instead of comparing')
+        parser.add_argument('--no-baseline', action='store_true',
+                            help='Check query budgets only, without comparing latencies')
+        parser.add_argument('--tolerance', type=float, default=0.5,
+                            help='Allowed p95 slowdown over the baseline, as a fraction')
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        self.data = SyntheticData(seed=options['seed'])
+        self.client = Client()
+        self.check_cases()
+        if options['save_baseline'] or options['no_baseline']:
+            baseline = {}
+        else:
+            baseline = self.load_baseline(options['baseline'])
+            unmeasured = [str(size) for size in sizes if str(size) not in baseline]
+            if unmeasured:
+                self.stdout.write(f'No baseline for {", ".join(unmeasured)} rows; only query budgets are checked there')
+
+        results, failures = {}, []
+        self.stdout.write(f'{"rows":>7} {"view":<20} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"queries":>8}')
+        # Measure uncached responses; the page cache would hide the database
+        with override_settings(PAGE_CACHE_TIMEOUT=0, CONTACT_WRITE_BEHIND=False, CONTACT_NOTIFICATIONS=False):
+            try:
+                # Work inside a transaction that is rolled back so real data is untouched
+                with transaction.atomic():
+                    self.seed_fixed()
+                    created = 0
+                    for size in sizes:
+                        self.seed(created, size)
+                        created = size
+                        results[str(size)] = self.run_size(size, options['requests'], baseline, failures,
+                                                           options['tolerance'])
+                    raise Rollback
+            except Rollback:
+                pass
+
+        if options['save_baseline']:
+            path = Path(options['baseline'])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+            self.stdout.write(f'Baseline written to {path}')
+        if failures:
+            raise CommandError('\n'.join(failures))
+
+    def cases(self):
+        """(label, url name, method, path) for every request in a round"""
+        detail_ids = self.detail_ids
+        self.sequence += 1
+        return [
+            ('home', 'main:home', 'get', reverse('main:home')),
+            ('about', 'main:about', 'get', reverse('main:about')),
+            ('projects', 'main:projects', 'get', reverse('main:projects')),
+            ('projects search', 'main:projects', 'get', reverse('main:projects') + '?search=payment+gateway'),
+            ('projects last page', 'main:projects', 'get', reverse('main:projects') + '?page=999999'),
+            ('project detail', 'main:project_detail', 'get',
+             reverse('main:project_detail', args=[detail_ids[self.sequence % len(detail_ids)]])),
+            ('contact submit', 'main:contact_submit', 'post', reverse('main:contact_submit')),
+            ('api projects', 'main:api_projects', 'get', reverse('main:api_projects')),
+            ('api skills', 'main:api_skills', 'get', reverse('main:api_skills')),
+            ('metrics', 'main:metrics', 'get', reverse('main:metrics')),
+            ('sitemap', None, 'get', '/sitemap.xml'),
+        ]
+
+    def check_cases(self):
+        """Fail if main/urls.py gained a URL that the suite does not drive"""
+        self.detail_ids, self.sequence = [uuid.uuid4()], 0
+        covered = {name for _, name, _, _ in self.cases()}
+        missing = [
+            f'main:{pattern.name}' for pattern in main_urls.urlpatterns
+            if f'main:{pattern.name}' not in covered
+        ]
+        if missing:
+            raise CommandError(f'No benchmark case for: {", ".join(missing)}')
+
+    def load_baseline(self, path):
+        try:
+            return json.loads(Path(path).read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            raise CommandError(f'No baseline at {path}; record one with --save-baseline, '
+                               'or pass --no-baseline to check query budgets only')
+
+    def run_size(self, size, requests, baseline, failures, tolerance):
+        timings, queries = {}, {}
+        # One unmeasured round fills per-process state such as the skill icon matcher
+        for _, _, method, path in self.cases():
+            self.request(method, path)
+        for _ in range(requests):
+            # A full collection inside a timed request costs tens of ms and would
+            # land on whichever view happened to trip it, so collect between rounds
+            gc.collect()
+            gc.disable()
+            try:
+                for label, _, method, path in self.cases():
+                    counter = QueryCounter()
+                    start = time.perf_counter()
+                    with connection.execute_wrapper(counter):
+                        response = self.request(method, path)
+                    timings.setdefault(label, []).append((time.perf_counter() - start) * 1000)
+                    queries[label] = max(queries.get(label, 0), counter.count)
+                    if response.status_code != 200:
+                        raise CommandError(f'{label} returned {response.status_code} at {size} rows')
+            finally:
+                gc.enable()
+
+        results = {}
+        for label, samples in timings.items():
+            cut = statistics.quantiles(samples, n=100)
+            results[label] = {'p50': cut[49], 'p95': cut[94], 'p99': cut[98], 'queries': queries[label]}
+            self.stdout.write(f'{size:>7} {label:<20} {cut[49]:>8.1f} {cut[94]:>8.1f} '
+                              f'{cut[98]:>8.1f} {queries[label]:>8}')
+
+            budget = QUERY_BUDGETS[label]
+            if queries[label] > budget:
+                failures.append(f'{label} at {size} rows ran {queries[label]} queries (budget {budget})')
+            previous = baseline.get(str(size), {}).get(label)
+            if previous and cut[94] > previous['p95'] * (1 + tolerance):
+                failures.append(f'{label} at {size} rows: p95 {cut[94]:.1f} ms, '
+                                f'baseline {previous["p95"]:.1f} ms')
+        return results
+
+    def request(self, method, path):
+        if method == 'post':
+            # A fresh address and payload each time keeps throttling out of the way
+            self.sequence += 1
+            payload = {
+                'name': 'Benchmark Sender',
+                'email': f'sender{self.sequence}@example.com',
+                'subject': f'Benchmark {self.sequence}',
+                'message': f'Load test message number {self.sequence} from the benchmark suite.',
+            }
+            return self.client.post(path, json.dumps(payload), content_type='application/json',
+                                    REMOTE_ADDR=f'10.{self.sequence >> 16 & 255}.{self.sequence >> 8 & 255}.'
+                                                f'{self.sequence & 255}')
+        return self.client.get(path)
+
+    def seed_fixed(self):
+        for model in (About, Project, Experience, ContactMessage):
+            model.objects.all().delete()
+        self.data.about().save()
+
+    def seed(self, start, stop):
+        """Add rows start..stop of each model, bypassing per-row save() work"""
+        began = time.perf_counter()
+        for model, generator in (
+            (Project, self.data.projects),
+            (Experience, self.data.experiences),
+            (ContactMessage, self.data.messages),
+        ):
+            for _ in bulk_insert(model, generator(stop - start, start)):
+                reset_queries()
+
+        get_search_backend().rebuild(Project.objects.all())
+        # Only the projects whose detail pages are requested need neighbours
+        sample = list(Project.objects.filter(is_public=True).order_by('?')[:DETAIL_SAMPLE])
+        for project in sample:
+            recompute_neighbours(project)
+        self.detail_ids = [project.id for project in sample]
+        self.stdout.write(f'Seeded {stop:,} rows per model in {time.perf_counter() - began:.1f}s')
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from main.cache import bump_content_version
+from main.fonts import ICON_STYLES, build_fonts, font_output_dir
+
+class Command(BaseCommand):
+    help = 'Subset the vendored icon and text fonts to the glyphs and weights the site uses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--icon', action='append', default=[], metavar='CLASSES',
+                            help="Also include an icon, e.g. --icon 'fas fa-star' (repeatable)")
+
+    def handle(self, *args, **options):
+        extra = []
+        for classes in options['icon']:
+            style, _, name = classes.partition(' ')
+            if style not in ICON_STYLES or not name.startswith('fa-'):
+                raise CommandError(f"Expected icon classes like 'fas fa-star', got {classes!r}")
+            extra.append((ICON_STYLES[style], name[3:]))
+        try:
+            sizes = build_fonts(extra)
+        except FileNotFoundError as e:
+            raise CommandError(str(e))
+        # Cached pages still link the CDN fonts
+        bump_content_version()
+        for name, size in sizes.items():
+            self.stdout.write(f'{name}: {size:,} bytes')
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {len(sizes)} fonts ({sum(sizes.values()):,} bytes) to {font_output_dir()}'
+        ))
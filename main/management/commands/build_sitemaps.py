@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from main.sitemap_files import build_sitemaps, sitemap_root
+import time
+
+class Command(BaseCommand):
+    help = 'Write sitemap.xml, its project shards and their gzipped copies for nginx to serve'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', help='Site address used in the URLs (defaults to SITE_URL)')
+        parser.add_argument('--shard-size', type=int, help='Most URLs per shard (defaults to SITEMAP_SHARD_SIZE)')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        manifest = build_sitemaps(options['base_url'], options['shard_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {sum(manifest["urls"]):,} project URLs in {manifest["shards"]} shards '
+            f'to {sitemap_root()} in {time.perf_counter() - start:.1f}s'
+        ))
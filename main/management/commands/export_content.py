@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from main.fixtures import CONTENT_MODELS, export_content, get_content_model
+
+class Command(BaseCommand):
+    help = 'Export portfolio content as JSON Lines for import_content'
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*',
+                            help=f'Models to export (default: {", ".join(m._meta.model_name for m in CONTENT_MODELS)})')
+        parser.add_argument('--output', '-o', help='File to write (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            models = [get_content_model(label) for label in options['models']]
+        except LookupError as e:
+            raise CommandError(str(e))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as stream:
+                counts = export_content(stream, models, options['chunk_size'])
+        else:
+            # OutputWrapper ends every write with a newline unless told otherwise,
+            # which would split the serializer's separate line endings into blank lines
+            self.stdout.ending = ''
+            counts = export_content(self.stdout, models, options['chunk_size'])
+
+        # Keep stdout clean for piping; the summary goes to stderr
+        for model, count in counts.items():
+            self.stderr.write(f'Exported {count:,} {model._meta.verbose_name_plural}')
@@ -0,0 +1,93 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import reset_queries
+from main.cache import bump_content_version
+from main.icons import invalidate_icon_matcher
+from main.models import About, Experience, Project, ContactMessage, Skill
+from main.related import rebuild_related_projects
+from main.search import get_search_backend
+from main.sitemap_files import build_sitemaps, sitemaps_built
+from main.synthetic import SyntheticData, bulk_insert, clear_rows
+import time
+
+class Command(BaseCommand):
+    help = 'Generate synthetic portfolio data at any scale for capacity testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=1000)
+        parser.add_argument('--experiences', type=int, default=100)
+        parser.add_argument('--skills', type=int, default=50)
+        parser.add_argument('--messages', type=int, default=1000)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--frameworks', default='zipf',
+                            help="Framework distribution: 'zipf', 'uniform' or 'Name:weight,...'")
+        parser.add_argument('--zipf-exponent', type=float, default=1.0)
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete existing projects, experiences, skills and messages first')
+        parser.add_argument('--related', action='store_true',
+                            help='Also rebuild related projects (slow for large catalogs)')
+
+    def handle(self, *args, **options):
+        try:
+            data = SyntheticData(seed=options['seed'], frameworks=options['frameworks'],
+                                 exponent=options['zipf_exponent'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['clear']:
+            start = time.perf_counter()
+            for model in (Project, Experience, Skill, ContactMessage):
+                clear_rows(model)
+            self.stdout.write(f'Cleared existing data in {time.perf_counter() - start:.1f}s')
+
+        if not About.objects.exists():
+            data.about().save()
+            self.stdout.write('Created About instance')
+
+        plans = [
+            (Project, options['projects'], data.projects),
+            (Experience, options['experiences'], data.experiences),
+            (Skill, options['skills'], data.skills),
+            (ContactMessage, options['messages'], data.messages),
+        ]
+        for model, count, generator in plans:
+            if count <= 0:
+                continue
+            # Continue numbering after existing rows so unique fields never clash
+            start = data.next_index(model)
+            # Skill names may already be taken by hand-entered skills
+            self.generate(model, generator(count, start), count, options['batch_size'],
+                          ignore_conflicts=model is Skill)
+
+        if options['projects'] > 0 or options['clear']:
+            start = time.perf_counter()
+            get_search_backend().rebuild(Project.objects.all())
+            self.stdout.write(f'Rebuilt search index in {time.perf_counter() - start:.1f}s')
+            if options['related']:
+                start = time.perf_counter()
+                rebuild_related_projects()
+                self.stdout.write(f'Rebuilt related projects in {time.perf_counter() - start:.1f}s')
+            if sitemaps_built():
+                build_sitemaps()
+
+        # Bulk writes skip the signals that normally invalidate cached pages
+        bump_content_version()
+        invalidate_icon_matcher()
+
+        self.stdout.write(self.style.SUCCESS('Synthetic data generated'))
+
+    def generate(self, model, rows, count, batch_size, ignore_conflicts=False):
+        name = model._meta.verbose_name_plural
+        inserted, elapsed, reported = 0, 0.0, 0
+        for rows_in_batch, seconds in bulk_insert(model, rows, batch_size, ignore_conflicts):
+            inserted += rows_in_batch
+            elapsed += seconds
+            # With DEBUG on, the query log would keep every batch's SQL alive
+            reset_queries()
+            # Report roughly ten times per model
+            if inserted - reported >= max(count // 10, batch_size) or inserted == count:
+                reported = inserted
+                self.stdout.write(f'  {name}: {inserted:,}/{count:,} ({inserted / elapsed:,.0f} rows/s)')
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {inserted:,} {name} in {elapsed:.1f}s ({inserted / elapsed if elapsed else 0:,.0f} rows/s)'
+        ))
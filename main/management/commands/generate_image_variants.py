@@ -0,0 +1,64 @@
+from concurrent.futures import ProcessPoolExecutor
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import connections
+from main.images import generate_variants, store_variants
+import time
+
+# The slot width in sizes= of components/project_card.html
+CARD_WIDTH = 340
+
+def generate(source):
+    """Worker process entry point; errors come back as values so one bad file stops nothing"""
+    try:
+        return generate_variants(source), None
+    except Exception as e:
+        return None, f'{type(e).__name__}: {e}'
+
+class Command(BaseCommand):
+    help = 'Make resized WebP and JPEG copies of uploaded project and profile images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1,
+                            help='Resize in this many worker processes (default: in this process)')
+        parser.add_argument('--force', action='store_true',
+                            help='Redo every image, not only those without current copies')
+
+    def handle(self, *args, **options):
+        jobs = []
+        for model in apps.get_app_config('main').get_models():
+            for field in getattr(model, 'image_fields', ()):
+                rows = model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                for pk, source, variants in rows.values_list('pk', field, f'{field}_variants').iterator():
+                    if options['force'] or (variants or {}).get('source') != source:
+                        jobs.append((model, pk, field, source, variants))
+        if not jobs:
+            self.stdout.write(self.style.SUCCESS('All images have current copies'))
+            return
+
+        start = time.perf_counter()
+        sources = [job[3] for job in jobs]
+        if options['processes'] > 1:
+            # Forked workers must not share this process's connections
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options['processes']) as pool:
+                results = list(pool.map(generate, sources, chunksize=4))
+        else:
+            results = map(generate, sources)
+
+        done = original_bytes = listing_bytes = 0
+        for (model, pk, field, source, previous), (variants, error) in zip(jobs, results):
+            if error:
+                self.stderr.write(f'{source}: {error}')
+                continue
+            if store_variants(model, pk, field, variants, previous):
+                done += 1
+                original_bytes += variants['bytes']
+                # The WebP copy a listing card picks on a standard-density screen
+                fits = [entry for entry in variants['webp'] if entry[0] >= CARD_WIDTH] or variants['webp'][-1:]
+                listing_bytes += default_storage.size(fits[0][2])
+        self.stdout.write(self.style.SUCCESS(
+            f'Resized {done} of {len(jobs)} images in {time.perf_counter() - start:.1f}s; '
+            f'originals {original_bytes:,} bytes, listing-size WebP copies {listing_bytes:,} bytes'
+        ))
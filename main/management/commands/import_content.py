@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+from main.fixtures import import_content
+import sys
+import time
+
+class Command(BaseCommand):
+    help = 'Upsert portfolio content from a JSON Lines export'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="JSON Lines file, or '-' for stdin")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--skip-related', action='store_true',
+                            help='Do not update related projects (run rebuild_related_projects later)')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            if options['path'] == '-':
+                counts = import_content(sys.stdin, options['batch_size'], not options['skip_related'])
+            else:
+                with open(options['path'], encoding='utf-8') as stream:
+                    counts = import_content(stream, options['batch_size'], not options['skip_related'])
+        except (OSError, ValueError, DeserializationError) as e:
+            raise CommandError(f'Import failed: {e.__cause__ or e}')
+
+        for model, count in counts.items():
+            self.stdout.write(f'Upserted {count:,} {model._meta.verbose_name_plural}')
+        self.stdout.write(self.style.SUCCESS(f'Import finished in {time.perf_counter() - start:.1f}s'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from main.gallery import measure_images, sync_gallery
+from main.models import GalleryImage, Project
+import time
+
+class Command(BaseCommand):
+    help = 'Record the size and placeholder of every project gallery image kept in local media'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Measure every local image again, not only new ones')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        # Bulk imports skip the signal that normally keeps the rows in step
+        projects = Project.objects.filter(~Q(gallery_images='') | Q(gallery__isnull=False)).distinct()
+        pending = []
+        for project in projects.iterator():
+            pending += sync_gallery(project)
+        if options['force']:
+            pending = list(GalleryImage.objects.values_list('pk', flat=True))
+        measured = measure_images(pending, force=options['force'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Measured {measured} of {len(pending)} gallery images in {time.perf_counter() - start:.1f}s'
+        ))
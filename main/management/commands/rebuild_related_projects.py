@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from main.related import rebuild_related_projects
+
+class Command(BaseCommand):
+    help = 'Recompute the related-projects similarity index for every project'
+
+    def handle(self, *args, **options):
+        count = rebuild_related_projects()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt related projects for {count} projects'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from main.models import Project
+from main.search import get_search_backend
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for projects'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        count = backend.rebuild(Project.objects.all())
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {count} projects with {backend.__class__.__name__}'
+        ))
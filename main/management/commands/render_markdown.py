@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from main.cache import bump_content_version
+from main.models import Experience, Project
+
+class Command(BaseCommand):
+    help = 'Backfill the stored HTML of markdown fields on projects and experiences'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--force', action='store_true',
+                            help='Re-render every row, not only rows whose HTML is missing')
+
+    def handle(self, *args, **options):
+        total = 0
+        for model in (Project, Experience):
+            count = self.render(model, options['batch_size'], options['force'])
+            total += count
+            self.stdout.write(f'Rendered {count} {model._meta.verbose_name_plural}')
+        if total:
+            # bulk_update skips the signals that normally invalidate cached pages
+            bump_content_version()
+        self.stdout.write(self.style.SUCCESS(f'Updated {total} rows'))
+
+    def render(self, model, batch_size, force):
+        fields = model.markdown_fields
+        targets = [f'{name}_html' for name in fields]
+        queryset = model.objects.only('pk', *fields, *targets).order_by('pk')
+        count, last = 0, None
+        while True:
+            # Page on the primary key so updates never race an open cursor
+            batch = list(queryset.filter(pk__gt=last)[:batch_size] if last else queryset[:batch_size])
+            if not batch:
+                return count
+            last = batch[-1].pk
+            changed = []
+            for obj in batch:
+                if force:
+                    obj._markdown_sources = {}
+                if obj.render_markdown_fields():
+                    changed.append(obj)
+            model.objects.bulk_update(changed, targets)
+            count += len(changed)
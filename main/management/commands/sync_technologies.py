@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from main.models import Project
+
+class Command(BaseCommand):
+    help = 'Rebuild the technology index from every project\'s frameworks'
+
+    def handle(self, *args, **options):
+        count = 0
+        for project in Project.objects.all().iterator(chunk_size=500):
+            project.sync_technologies()
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Synced technologies for {count} projects'))
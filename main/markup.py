@@ -0,0 +1,77 @@
+from django.utils.html import escape, linebreaks
+from django.utils.safestring import mark_safe
+from functools import lru_cache
+import re
+
+MARKDOWN_CACHE_SIZE = 1024
+
+MARKDOWN_PATTERNS = [
+    (re.compile(r'\*\*(.*?)\*\*'), r'<strong>\1</strong>'),
+    (re.compile(r'\*(.*?)\*'), r'<em>\1</em>'),
+    (re.compile(r'`(.*?)`'), r'<code>\1</code>'),
+]
+
+@lru_cache(maxsize=MARKDOWN_CACHE_SIZE)
+def render_markdown(text):
+    """Convert basic markdown (bold, italics, inline code) to paragraphs of HTML
+
+    The text is escaped first, so the result is safe to store and to
+    output as-is. Results are memoized per process.
+    """
+    if not text:
+        return ''
+    result = escape(text)
+    for pattern, replacement in MARKDOWN_PATTERNS:
+        result = pattern.sub(replacement, result)
+    return mark_safe(linebreaks(result))
+
+HIGHLIGHT_CACHE_SIZE = 256
+
+HIGHLIGHT_COLORS = {
+    'comment': 'var(--terminal-green)',
+    'string': 'var(--warning-color)',
+    'keyword': 'var(--terminal-blue)',
+    'constant': 'var(--terminal-purple)',
+    'number': 'var(--terminal-orange)',
+}
+
+HIGHLIGHT_SPANS = {name: f'<span style="color: {color};">' for name, color in HIGHLIGHT_COLORS.items()}
+
+# One alternation scanned left to right. The first group to match at a
+# position wins, so a '#' inside a string never starts a comment. Other
+# identifiers are consumed whole (and left alone) so the scan skips over
+# them instead of retrying every group inside them, and the lookahead
+# rejects punctuation and spaces before any group is tried.
+HIGHLIGHT_TOKENS = re.compile(r'''
+    (?=[\#"'\w])
+    (?:
+        (?P<comment>\#[^\n]*)
+      | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+      | (?P<keyword>\b(?:def|class|import|from|if|else|elif|for|while|try|except|finally|with|as
+                       |return|yield|break|continue|pass|lambda|global|nonlocal)\b)
+      | (?P<constant>\b(?:True|False|None)\b)
+      | (?P<number>\b\d+\b)
+      | [A-Za-z_]\w*
+    )
+''', re.VERBOSE)
+
+@lru_cache(maxsize=HIGHLIGHT_CACHE_SIZE)
+def highlight_code(code):
+    """Wrap Python-like tokens in colored spans in a single pass over the text
+
+    The text is escaped first, and spans never nest or overlap. Results
+    are memoized per process.
+    """
+    if not code:
+        return ''
+    # Quotes stay as they are so strings can be recognised; outside of
+    # attributes they need no escaping
+    code = code.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    parts, position = [], 0
+    for match in HIGHLIGHT_TOKENS.finditer(code):
+        if match.lastgroup:
+            parts.append(code[position:match.start()])
+            parts.append(f'{HIGHLIGHT_SPANS[match.lastgroup]}{match.group()}</span>')
+            position = match.end()
+    parts.append(code[position:])
+    return mark_safe(''.join(parts))
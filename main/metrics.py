@@ -0,0 +1,333 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from bisect import bisect_left
+from contextvars import ContextVar
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates
+from pathlib import Path
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+METRICS = {
+    'portfolio_requests_total': ('counter', 'HTTP requests by view, method and status'),
+    'portfolio_request_duration_seconds': ('histogram', 'Time spent handling a request'),
+    'portfolio_request_queries': ('histogram', 'SQL queries run per request'),
+    'portfolio_db_query_seconds_total': ('counter', 'Time spent in SQL queries'),
+    'portfolio_template_render_seconds': ('histogram', 'Time spent rendering templates per request'),
+    'portfolio_contact_queue': ('counter', 'Contact write-behind queue counters'),
+    'portfolio_contact_queue_depth': ('gauge', 'Contact messages waiting to be flushed'),
+    'portfolio_notifications': ('counter', 'Notification dispatcher counters'),
+    'portfolio_notifications_depth': ('gauge', 'Notifications waiting to be sent'),
+    'portfolio_fragment_cache_total': ('counter', 'Template fragments served from or added to the fragment cache'),
+}
+BUCKETS = {
+    'portfolio_request_duration_seconds': DURATION_BUCKETS,
+    'portfolio_request_queries': QUERY_BUCKETS,
+    'portfolio_template_render_seconds': DURATION_BUCKETS,
+}
+
+class RequestStats:
+    """Database and template cost accumulated while serving one request"""
+
+    __slots__ = ('queries', 'query_seconds', 'template_seconds')
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.template_seconds = 0.0
+
+# Context variables follow requests into sync_to_async threads, so async
+# views are measured the same way as sync ones
+_request_stats = ContextVar('main_request_stats', default=None)
+
+class Registry:
+    """Counters, gauges and histograms for one process
+
+    Values are keyed by (metric name, sorted label pairs). Histograms keep
+    per-bucket counts, with the overflow bucket last, plus the sum.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self._observe(key, bisect_left(BUCKETS[name], value), value)
+
+    def _observe(self, key, index, value, count=1):
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = [[0] * (len(BUCKETS[key[0]]) + 1), 0.0]
+        histogram[0][index] += count
+        histogram[1] += value
+
+    def snapshot(self):
+        """Return the registry as JSON-serializable data"""
+        with self.lock:
+            return {
+                'counters': [[name, labels, value] for (name, labels), value in self.counters.items()],
+                'gauges': [[name, labels, value] for (name, labels), value in self.gauges.items()],
+                'histograms': [
+                    [name, labels, list(counts), total]
+                    for (name, labels), (counts, total) in self.histograms.items()
+                ],
+            }
+
+    def merge(self, snapshot):
+        """Add another process's snapshot"""
+        with self.lock:
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(map(tuple, labels)))
+                self.counters[key] = self.counters.get(key, 0) + value
+            for name, labels, value in snapshot['gauges']:
+                key = (name, tuple(map(tuple, labels)))
+                self.gauges[key] = self.gauges.get(key, 0) + value
+            for name, labels, counts, total in snapshot['histograms']:
+                if name not in BUCKETS or len(counts) != len(BUCKETS[name]) + 1:
+                    continue
+                key = (name, tuple(map(tuple, labels)))
+                for index, count in enumerate(counts):
+                    self._observe(key, index, 0.0, count)
+                self.histograms[key][1] += total
+
+    def render(self):
+        """Render the registry in the Prometheus text exposition format"""
+        series = {}
+        with self.lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                series.setdefault(name, []).append(f'{name}{_labels(labels)} {_number(value)}')
+            for (name, labels), value in sorted(self.gauges.items()):
+                series.setdefault(name, []).append(f'{name}{_labels(labels)} {_number(value)}')
+            for (name, labels), (counts, total) in sorted(self.histograms.items()):
+                lines = series.setdefault(name, [])
+                cumulative = 0
+                for bound, count in zip(BUCKETS[name] + ('+Inf',), counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_labels(labels + (("le", _number(bound)),))} {cumulative}')
+                lines.append(f'{name}_sum{_labels(labels)} {_number(total)}')
+                lines.append(f'{name}_count{_labels(labels)} {cumulative}')
+
+        output = []
+        for name in sorted(series):
+            kind, description = METRICS.get(name, ('untyped', name))
+            output.append(f'# HELP {name} {description}')
+            output.append(f'# TYPE {name} {kind}')
+            output.extend(series[name])
+        return '\n'.join(output) + '\n'
+
+def _labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels
+    )
+    return '{' + pairs + '}'
+
+def _number(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+_registry = None
+_registry_pid = None
+_last_write = 0.0
+
+def get_registry():
+    """Return this process's registry, starting afresh in forked workers"""
+    global _registry, _registry_pid
+    if _registry_pid != os.getpid():
+        _registry = Registry()
+        _registry_pid = os.getpid()
+        if settings.METRICS_DIR:
+            atexit.register(write_snapshot)
+    return _registry
+
+def _component_snapshot():
+    """This process's registry plus contact queue and notification counters"""
+    from . import contact_queue, notifications
+
+    registry = get_registry()
+    components = (
+        ('portfolio_contact_queue', contact_queue._contact_queue),
+        ('portfolio_notifications', notifications._dispatcher),
+    )
+    snapshot = registry.snapshot()
+    for name, component in components:
+        if component is None:
+            continue
+        for key, value in component.get_metrics().items():
+            if key == 'depth':
+                snapshot['gauges'].append([f'{name}_depth', [], value])
+            elif key in component.stats and not key.startswith('last_'):
+                snapshot['counters'].append([name, [['event', key]], value])
+    return snapshot
+
+def _snapshot_path(pid):
+    return Path(settings.METRICS_DIR) / f'metrics-{pid}.json'
+
+def write_snapshot():
+    """Publish this process's metrics to the shared directory"""
+    global _last_write
+    _last_write = time.monotonic()
+    path = _snapshot_path(os.getpid())
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(_component_snapshot()), encoding='utf-8')
+        os.replace(temporary, path)
+    except OSError as e:
+        logger.error(f"Error writing metrics snapshot: {e}")
+
+def _maybe_write_snapshot():
+    if settings.METRICS_DIR and time.monotonic() - _last_write >= settings.METRICS_WRITE_INTERVAL:
+        write_snapshot()
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def render_metrics():
+    """Render metrics for every worker sharing METRICS_DIR, or just this one
+
+    Snapshots of workers that have exited are deleted rather than summed on
+    every scrape; Prometheus reads the drop in the totals as a counter reset.
+    """
+    merged = Registry()
+    if settings.METRICS_DIR:
+        for path in Path(settings.METRICS_DIR).glob('metrics-*.json'):
+            try:
+                pid = int(path.stem.split('-', 1)[1])
+                if pid == os.getpid():
+                    continue
+                if not _alive(pid):
+                    path.unlink(missing_ok=True)
+                    continue
+                merged.merge(json.loads(path.read_text(encoding='utf-8')))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error(f"Error reading metrics snapshot {path.name}: {e}")
+    merged.merge(_component_snapshot())
+    return merged.render()
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting queries for the current request"""
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.query_seconds += time.perf_counter() - start
+
+def install_query_wrapper(sender, connection, **kwargs):
+    """connection_created handler; covers the connections of every thread"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+class TimedTemplate:
+    """Wraps a backend template to add its render time to the request"""
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        stats = _request_stats.get()
+        if stats is None:
+            return self.template.render(context, request)
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            stats.template_seconds += time.perf_counter() - start
+
+class InstrumentedTemplates(DjangoTemplates):
+    """Django template backend that reports top-level render time
+
+    Included templates render inside their parent, so only the templates
+    loaded through the backend are timed and nothing is counted twice.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
+
+class MetricsMiddleware:
+    """Record latency, SQL and template cost per URL name
+
+    Place it first in MIDDLEWARE so the timing covers the other middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, start = RequestStats(), time.perf_counter()
+        token = _request_stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self.record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        stats, start = RequestStats(), time.perf_counter()
+        token = _request_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self.record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    def record(self, request, response, stats, elapsed):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        registry = get_registry()
+        registry.inc('portfolio_requests_total', {
+            'view': view, 'method': request.method, 'status': response.status_code,
+        })
+        registry.observe('portfolio_request_duration_seconds', {'view': view}, elapsed)
+        registry.observe('portfolio_request_queries', {'view': view}, stats.queries)
+        registry.inc('portfolio_db_query_seconds_total', {'view': view}, stats.query_seconds)
+        registry.observe('portfolio_template_render_seconds', {'view': view}, stats.template_seconds)
+        _maybe_write_snapshot()
@@ -1,7 +1,9 @@
 from django.db import models
+from django.core.files.storage import default_storage
 from django.core.validators import URLValidator, EmailValidator
 from django.utils import timezone
 from django.urls import reverse
+from .markup import render_markdown
 import uuid
 
 class TimeStampedModel(models.Model):
@@ -12,7 +14,88 @@ class TimeStampedModel(models.Model):
     class Meta:
         abstract = True
 
-class About(TimeStampedModel):
+class MarkdownFieldsMixin:
+    """Stores the HTML of each field in markdown_fields in a <field>_html companion
+
+    The HTML is rendered on save and only when the source text changed
+    since the row was loaded, so pages never convert markdown themselves.
+    """
+    markdown_fields = ()
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._markdown_sources = {name: instance.__dict__.get(name) for name in cls.markdown_fields}
+        return instance
+    
+    def render_markdown_fields(self):
+        """Refresh the HTML of changed markdown fields; return the companion field names"""
+        sources = getattr(self, '_markdown_sources', {})
+        updated = []
+        for name in self.markdown_fields:
+            text = getattr(self, name)
+            if name not in sources or sources[name] != text or (text and not getattr(self, f'{name}_html')):
+                setattr(self, f'{name}_html', render_markdown(text))
+                sources[name] = text
+                updated.append(f'{name}_html')
+        self._markdown_sources = sources
+        return updated
+    
+    def save(self, *args, **kwargs):
+        updated = self.render_markdown_fields()
+        if kwargs.get('update_fields') is not None and updated:
+            kwargs['update_fields'] = {*kwargs['update_fields'], *updated}
+        super().save(*args, **kwargs)
+
+class ImageVariantsMixin:
+    """Keeps resized copies of each field in image_fields, listed in <field>_variants
+
+    A save that changes an image notes the field in _changed_images for
+    the post_save receiver, which has the copies made off the request
+    thread (see main.images). Until they exist, the list still names the
+    old source and pages show the original.
+    """
+    image_fields = ()
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._image_sources = {name: instance.__dict__.get(name) or '' for name in cls.image_fields}
+        return instance
+    
+    def save(self, *args, **kwargs):
+        sources = getattr(self, '_image_sources', {})
+        # Read by the post_save receiver, which runs inside super().save()
+        self._changed_images = [
+            name for name in self.image_fields if (getattr(self, name).name or '') != sources.get(name, '')
+        ]
+        super().save(*args, **kwargs)
+        # Saving the field stored any upload and settled its final name
+        self._image_sources = {name: getattr(self, name).name or '' for name in self.image_fields}
+
+def split_list(value):
+    """Split comma-separated text into stripped, non-empty items"""
+    if not value:
+        return []
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+class ListFieldsMixin:
+    """Parses comma-separated text fields once per instance
+
+    The parsed list is kept until the field's text changes, so templates
+    and loops can call the get_*_list accessors freely. Callers share the
+    returned list and must not modify it.
+    """
+    
+    def parsed_list(self, field):
+        text = getattr(self, field)
+        parsed = self.__dict__.setdefault('_parsed_lists', {})
+        cached = parsed.get(field)
+        if cached is None or cached[0] != text:
+            cached = parsed[field] = (text, split_list(text))
+        return cached[1]
+
+class About(ListFieldsMixin, ImageVariantsMixin, TimeStampedModel):
     """Model for personal information and about section"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100, default="Abdulaziz Hamidjonov")
@@ -22,6 +105,12 @@ class About(TimeStampedModel):
                 "Experienced in building scalable web applications, machine learning solutions, and automated systems."
     )
     profile_image = models.ImageField(upload_to='profile/', blank=True, null=True)
+    profile_image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized copies of profile_image, made after upload"
+    )
     resume_file = models.FileField(upload_to='resume/', blank=True, null=True)
     
     # Social Links
@@ -64,6 +153,8 @@ class About(TimeStampedModel):
         help_text="Comma-separated keywords for SEO"
     )
     
+    image_fields = ('profile_image',)
+    
     class Meta:
         verbose_name = "About Me"
         verbose_name_plural = "About Me"
@@ -73,7 +164,7 @@ class About(TimeStampedModel):
     
     def get_skills_list(self):
         """Return skills as a list"""
-        return [skill.strip() for skill in self.skills.split(',') if skill.strip()]
+        return self.parsed_list('skills')
     
     def get_social_links(self):
         """Return all social links as a dictionary"""
@@ -96,7 +187,7 @@ class About(TimeStampedModel):
             links['website'] = self.website_url
         return links
 
-class Experience(TimeStampedModel):
+class Experience(ListFieldsMixin, MarkdownFieldsMixin, TimeStampedModel):
     """Model for work experience, education, and certifications"""
     EXPERIENCE_TYPES = [
         ('work', 'Work Experience'),
@@ -127,6 +218,13 @@ class Experience(TimeStampedModel):
         blank=True,
         help_text="Key achievements and accomplishments"
     )
+    achievements_html = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="Rendered from achievements on save"
+    )
+    
+    markdown_fields = ('achievements',)
     
     class Meta:
         ordering = ['-start_date', 'order']
@@ -152,11 +250,28 @@ class Experience(TimeStampedModel):
     
     def get_skills_list(self):
         """Return skills as a list"""
-        if not self.skills_used:
-            return []
-        return [skill.strip() for skill in self.skills_used.split(',') if skill.strip()]
+        return self.parsed_list('skills_used')
+
+class Technology(models.Model):
+    """Normalized technology referenced by projects' frameworks lists"""
+    # As long as Project.frameworks, which may hold a single entry
+    name = models.CharField(max_length=500)
+    key = models.CharField(max_length=500, unique=True, help_text="Lowercased name used for lookups")
+    
+    class Meta:
+        ordering = ['name']
+        verbose_name = "Technology"
+        verbose_name_plural = "Technologies"
+    
+    def __str__(self):
+        return self.name
+    
+    @staticmethod
+    def normalize(name):
+        """Return the lookup key for a technology name"""
+        return name.strip().lower()
 
-class Project(TimeStampedModel):
+class Project(ListFieldsMixin, MarkdownFieldsMixin, ImageVariantsMixin, TimeStampedModel):
     """Model for portfolio projects"""
     STATUS_CHOICES = [
         ('planning', 'Planning'),
@@ -174,6 +289,11 @@ class Project(TimeStampedModel):
         blank=True,
         help_text="Detailed project description for project detail page"
     )
+    detailed_description_html = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="Rendered from detailed_description on save"
+    )
     
     # Technologies and frameworks
     frameworks = models.CharField(
@@ -181,6 +301,14 @@ class Project(TimeStampedModel):
         help_text="Comma-separated list of frameworks/technologies used"
     )
     
+    technologies = models.ManyToManyField(
+        Technology,
+        blank=True,
+        editable=False,
+        related_name='projects',
+        help_text="Maintained from frameworks on save"
+    )
+    
     # Links
     project_link = models.URLField(blank=True, null=True, help_text="Live project URL")
     github_link = models.URLField(blank=True, null=True, help_text="GitHub repository URL")
@@ -188,6 +316,12 @@ class Project(TimeStampedModel):
     
     # Media
     image = models.ImageField(upload_to='projects/', blank=True, null=True)
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized copies of image, made after upload"
+    )
     gallery_images = models.TextField(
         blank=True,
         help_text="Comma-separated list of additional image URLs"
@@ -212,32 +346,72 @@ class Project(TimeStampedModel):
         help_text="Meta description for SEO (max 160 characters)"
     )
     
+    markdown_fields = ('detailed_description',)
+    image_fields = ('image',)
+    # What the technology links and the related-projects index are built from
+    related_fields = ('frameworks', 'status', 'is_featured', 'is_public')
+    
     class Meta:
         ordering = ['-is_featured', 'order', '-created_at']
+        indexes = [
+            # Keyset pagination walks this order; the id breaks ties
+            models.Index(fields=['-is_featured', 'order', '-created_at', 'id'], name='project_listing_idx'),
+            # Max('updated_at') for the listing's ETag and Last-Modified
+            models.Index(fields=['updated_at'], name='project_updated_idx'),
+        ]
         verbose_name = "Project"
         verbose_name_plural = "Projects"
     
     def __str__(self):
         return self.title
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._related_sources = {name: instance.__dict__.get(name) for name in cls.related_fields}
+        return instance
+    
     def save(self, *args, **kwargs):
         if not self.slug:
             from django.utils.text import slugify
             self.slug = slugify(self.title)
         super().save(*args, **kwargs)
+        # Edits to the title or description leave the indexes as they are
+        sources = getattr(self, '_related_sources', {})
+        saved = kwargs.get('update_fields') or self.related_fields
+        changed = {
+            name for name in self.related_fields
+            if name in saved and (name not in sources or sources[name] != getattr(self, name))
+        }
+        if 'frameworks' in changed:
+            self.sync_technologies()
+        if changed:
+            from .related import update_related_projects
+            update_related_projects(self)
+        self._related_sources = dict(sources, **{name: getattr(self, name) for name in changed})
+    
+    def sync_technologies(self):
+        """Mirror the frameworks string into the technology index"""
+        names = {}
+        for fw in self.get_frameworks_list():
+            names.setdefault(Technology.normalize(fw), fw)
+        if names:
+            Technology.objects.bulk_create(
+                [Technology(name=name, key=key) for key, name in names.items()],
+                ignore_conflicts=True
+            )
+        self.technologies.set(Technology.objects.filter(key__in=names))
     
     def get_absolute_url(self):
         return reverse('main:project_detail', kwargs={'project_id': self.id})
     
     def get_frameworks_list(self):
         """Return frameworks as a list"""
-        return [fw.strip() for fw in self.frameworks.split(',') if fw.strip()]
+        return self.parsed_list('frameworks')
     
     def get_gallery_images(self):
         """Return gallery images as a list"""
-        if not self.gallery_images:
-            return []
-        return [img.strip() for img in self.gallery_images.split(',') if img.strip()]
+        return self.parsed_list('gallery_images')
     
     def get_duration(self):
         """Calculate project duration"""
@@ -256,6 +430,71 @@ class Project(TimeStampedModel):
             years = duration.days // 365
             return f"{years} year{'s' if years > 1 else ''}"
 
+def sync_technologies_bulk(projects):
+    """Project.sync_technologies for many projects in a few queries
+
+    Rows written with bulk_create skip save(), so their technology links
+    are refreshed through this instead.
+    """
+    names = {}
+    for project in projects:
+        for fw in project.get_frameworks_list():
+            names.setdefault(Technology.normalize(fw), fw)
+    if names:
+        Technology.objects.bulk_create(
+            [Technology(name=name, key=key) for key, name in names.items()],
+            ignore_conflicts=True
+        )
+    ids = dict(Technology.objects.filter(key__in=names).values_list('key', 'id'))
+
+    through = Project.technologies.through
+    through.objects.filter(project_id__in=[project.pk for project in projects]).delete()
+    through.objects.bulk_create([
+        through(project_id=project.pk, technology_id=ids[key])
+        for project in projects
+        for key in {Technology.normalize(fw) for fw in project.get_frameworks_list()}
+    ])
+
+class GalleryImage(models.Model):
+    """One entry of Project.gallery_images with its measured size, maintained by main.gallery"""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='gallery')
+    url = models.CharField(max_length=500, help_text="The entry as written in gallery_images")
+    order = models.PositiveIntegerField(default=0)
+    width = models.PositiveIntegerField(blank=True, null=True)
+    height = models.PositiveIntegerField(blank=True, null=True)
+    placeholder = models.TextField(blank=True, help_text="Tiny copy of the image as a data URI")
+    
+    class Meta:
+        ordering = ['order']
+        unique_together = ['project', 'url']
+        verbose_name = "Gallery Image"
+        verbose_name_plural = "Gallery Images"
+    
+    def __str__(self):
+        return f"{self.project} #{self.order}: {self.url}"
+    
+    @property
+    def src(self):
+        """URL for <img src>; bare names are files in media storage"""
+        if '://' in self.url or self.url.startswith('/'):
+            return self.url
+        return default_storage.url(self.url)
+
+class RelatedProject(models.Model):
+    """Precomputed top neighbours of a project, maintained by main.related"""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='neighbours')
+    related = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='neighbour_of')
+    score = models.FloatField()
+    
+    class Meta:
+        ordering = ['-score']
+        unique_together = ['project', 'related']
+        verbose_name = "Related Project"
+        verbose_name_plural = "Related Projects"
+    
+    def __str__(self):
+        return f"{self.project} -> {self.related} ({self.score:.2f})"
+
 class ContactMessage(TimeStampedModel):
     """Model for contact form messages"""
     PRIORITY_CHOICES = [
@@ -0,0 +1,254 @@
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+import atexit
+import logging
+import os
+import queue
+import smtplib
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class NotificationDispatcher:
+    """Background email sender that keeps its SMTP connections open
+
+    Each worker thread owns one persistent connection and sends whatever
+    is queued in batches over it, so a burst of notifications costs a single
+    TLS handshake instead of one per message. Failed messages are retried
+    with exponential backoff.
+    """
+
+    def __init__(self, workers=1, batch_size=20, max_retries=5, retry_delay=1.0,
+                 idle_timeout=60.0, connection_kwargs=None):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.idle_timeout = idle_timeout
+        self.connection_kwargs = connection_kwargs or {}
+        self.pid = None
+        self.lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            'queued': 0,
+            'sent': 0,
+            'failed': 0,
+            'retries': 0,
+            'batches': 0,
+            'connections_opened': 0,
+            'send_seconds': 0.0,
+        }
+
+    def start(self):
+        self.pid = os.getpid()
+        self.queue = queue.Queue()
+        self.stopping = threading.Event()
+        self.threads = [
+            threading.Thread(target=self.run, name=f'notification-worker-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+        atexit.register(self.stop)
+
+    def ensure_started(self):
+        if self.pid != os.getpid():
+            with self.lock:
+                if self.pid != os.getpid():
+                    self.start()
+
+    def send(self, message):
+        """Queue an EmailMessage for background delivery"""
+        self.ensure_started()
+        self.queue.put((message, 0))
+        self.count('queued')
+
+    def count(self, name, value=1):
+        with self.stats_lock:
+            self.stats[name] += value
+
+    def open_connection(self):
+        connection = get_connection(fail_silently=False, **self.connection_kwargs)
+        connection.open()
+        self.count('connections_opened')
+        return connection
+
+    def run(self):
+        connection = None
+        while True:
+            try:
+                batch = [self.queue.get(timeout=self.idle_timeout)]
+            except queue.Empty:
+                # Let idle connections go before the server drops them
+                if connection is not None:
+                    connection.close()
+                    connection = None
+                if self.stopping.is_set():
+                    return
+                continue
+            if batch[0] is None:
+                connection = self.drain(connection)
+                break
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.queue.put(None)
+                    break
+                batch.append(item)
+
+            connection = self.deliver(batch, connection)
+
+        if connection is not None:
+            connection.close()
+
+    def drain(self, connection):
+        """Deliver what is still queued once stop() has been called
+
+        Retries requeued by any worker land behind the stop markers, so they
+        are sent here rather than dropped at exit. Markers meant for other
+        workers are handed back once the queue is empty.
+        """
+        markers = 0
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    markers += 1
+                else:
+                    batch.append(item)
+            if not batch:
+                break
+            connection = self.deliver(batch, connection)
+        for _ in range(markers):
+            self.queue.put(None)
+        return connection
+
+    def deliver(self, batch, connection):
+        """Send a batch one message at a time; return the connection to keep using
+
+        Only messages that failed are retried, so one refused recipient never
+        resends the rest of the batch. Messages that cannot be built at all
+        (a header with a line break, say) are dropped.
+        """
+        failed = []
+        start = time.perf_counter()
+        for index, (message, attempts) in enumerate(batch):
+            try:
+                if connection is None:
+                    connection = self.open_connection()
+                connection.send_messages([message])
+                self.count('sent')
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                # The server turned this message down; the connection is fine
+                logger.error(f"Error sending notification to {', '.join(message.to)}: {e}")
+                failed.append((message, attempts))
+            except (smtplib.SMTPException, OSError) as e:
+                logger.error(f"Error sending {len(batch) - index} notifications: {e}")
+                if connection is not None:
+                    connection.close()
+                    connection = None
+                failed.extend(batch[index:])
+                break
+            except Exception as e:
+                self.count('failed')
+                logger.error(f"Dropping notification that cannot be sent: {e}")
+        with self.stats_lock:
+            self.stats['batches'] += 1
+            self.stats['send_seconds'] += time.perf_counter() - start
+        if failed:
+            self.retry(failed)
+        return connection
+
+    def retry(self, items):
+        """Requeue failed messages after a backoff, dropping those out of retries"""
+        again = []
+        for message, attempts in items:
+            if attempts + 1 > self.max_retries:
+                self.count('failed')
+                logger.error(f"Dropping notification to {', '.join(message.to)} after {self.max_retries} retries")
+            else:
+                again.append((message, attempts + 1))
+        if not again:
+            return
+        self.count('retries')
+        self.stopping.wait(self.retry_delay * 2 ** (max(attempts for _, attempts in again) - 1))
+        for item in again:
+            self.queue.put(item)
+
+    def stop(self, timeout=10):
+        """Deliver what is queued, then stop the workers"""
+        if self.pid != os.getpid():
+            return
+        self.stopping.set()
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join(timeout=timeout)
+        self.pid = None
+
+    def get_metrics(self):
+        """Return delivery counters and send throughput in messages per second"""
+        with self.stats_lock:
+            metrics = dict(self.stats)
+        metrics['depth'] = self.queue.qsize() if self.pid == os.getpid() else 0
+        metrics['throughput'] = (
+            metrics['sent'] / metrics['send_seconds'] if metrics['send_seconds'] else 0.0
+        )
+        return metrics
+
+_dispatcher = None
+
+def get_dispatcher():
+    """Return the process-wide notification dispatcher"""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = NotificationDispatcher(
+            workers=settings.NOTIFICATION_WORKERS,
+            batch_size=settings.NOTIFICATION_BATCH_SIZE,
+            max_retries=settings.NOTIFICATION_MAX_RETRIES,
+        )
+    return _dispatcher
+
+def _one_line(text):
+    """Text safe for a mail header, which must not contain line breaks"""
+    return ' '.join(text.split())
+
+def build_notifications(contact_message):
+    """Build the owner alert and, if enabled, the auto-reply for a message"""
+    context = {'message': contact_message}
+    subject = _one_line(contact_message.subject)
+    messages = []
+    if settings.CONTACT_NOTIFY_EMAIL:
+        messages.append(EmailMessage(
+            subject=f"[Portfolio] {subject}",
+            body=render_to_string('emails/contact_notification.txt', context),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[settings.CONTACT_NOTIFY_EMAIL],
+            reply_to=[contact_message.email],
+        ))
+    if settings.CONTACT_AUTO_REPLY:
+        messages.append(EmailMessage(
+            subject=f"Re: {subject}",
+            body=render_to_string('emails/contact_auto_reply.txt', context),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[contact_message.email],
+        ))
+    return messages
+
+def notify_new_messages(contact_messages):
+    """Queue notifications for newly stored contact messages"""
+    if not settings.CONTACT_NOTIFICATIONS:
+        return
+    dispatcher = get_dispatcher()
+    for contact_message in contact_messages:
+        for message in build_notifications(contact_message):
+            dispatcher.send(message)
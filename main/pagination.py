@@ -0,0 +1,37 @@
+from django.db.models import Q
+from datetime import datetime
+import base64
+import json
+import uuid
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(row):
+    """Encode the ordering key of the last row on a page"""
+    payload = [row['is_featured'], row['order'], row['created_at'].isoformat(), str(row['id'])]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        is_featured, order, created_at, pk = json.loads(base64.urlsafe_b64decode(padded))
+        return bool(is_featured), int(order), datetime.fromisoformat(created_at), uuid.UUID(pk)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(str(e)) from e
+
+def after_cursor(cursor):
+    """Filter for rows after a cursor in '-is_featured, order, -created_at, id' order"""
+    is_featured, order, created_at, pk = decode_cursor(cursor)
+    same_featured = Q(is_featured=is_featured)
+    same_order = same_featured & Q(order=order)
+    same_created = same_order & Q(created_at=created_at)
+    condition = (
+        (same_featured & Q(order__gt=order)) |
+        (same_order & Q(created_at__lt=created_at)) |
+        (same_created & Q(id__gt=pk))
+    )
+    if is_featured:
+        condition |= Q(is_featured=False)
+    return condition
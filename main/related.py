@@ -0,0 +1,142 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from .models import Project, RelatedProject
+import heapq
+
+STATUS_WEIGHTS = {
+    'completed': 1.0,
+    'maintenance': 1.0,
+    'development': 0.9,
+    'planning': 0.75,
+    'archived': 0.6,
+}
+FEATURED_BOOST = 1.2
+CHUNK_SIZE = 500
+
+def get_neighbour_limit():
+    return getattr(settings, 'RELATED_PROJECTS_LIMIT', 6)
+
+def project_weight(status, is_featured):
+    """Weight applied to a project when it is suggested as related"""
+    weight = STATUS_WEIGHTS.get(status, 1.0)
+    return weight * FEATURED_BOOST if is_featured else weight
+
+def jaccard(shared, size_a, size_b):
+    """Jaccard similarity of two sets from their sizes and overlap"""
+    union = size_a + size_b - shared
+    return shared / union if union else 0.0
+
+def find_candidates(project):
+    """Return {project_id: (jaccard, weight, is_public)} for projects sharing a technology"""
+    tech_ids = list(project.technologies.values_list('id', flat=True))
+    if not tech_ids:
+        return {}
+
+    through = Project.technologies.through
+    shared_counts = dict(
+        through.objects.filter(technology_id__in=tech_ids)
+        .exclude(project_id=project.pk)
+        .values('project_id')
+        .annotate(shared=Count('id'))
+        .values_list('project_id', 'shared')
+    )
+
+    candidates = {}
+    ids = list(shared_counts)
+    for start in range(0, len(ids), CHUNK_SIZE):
+        rows = (
+            Project.objects.filter(pk__in=ids[start:start + CHUNK_SIZE])
+            .annotate(tech_count=Count('technologies'))
+            .values_list('pk', 'tech_count', 'status', 'is_featured', 'is_public')
+        )
+        for pk, tech_count, status, is_featured, is_public in rows:
+            similarity = jaccard(shared_counts[pk], len(tech_ids), tech_count)
+            candidates[pk] = (similarity, project_weight(status, is_featured), is_public)
+    return candidates
+
+def store_neighbours(project_id, scored):
+    """Replace a project's neighbour list with the top scored (score, id) pairs"""
+    top = heapq.nlargest(get_neighbour_limit(), scored)
+    RelatedProject.objects.filter(project_id=project_id).delete()
+    RelatedProject.objects.bulk_create([
+        RelatedProject(project_id=project_id, related_id=related_id, score=score)
+        for score, related_id in top
+    ])
+
+def recompute_neighbours(project):
+    """Recompute one project's neighbour list from scratch"""
+    candidates = find_candidates(project)
+    store_neighbours(project.pk, [
+        (similarity * weight, pk)
+        for pk, (similarity, weight, is_public) in candidates.items()
+        if similarity and is_public
+    ])
+    return candidates
+
+@transaction.atomic
+def update_related_projects(project):
+    """Refresh the similarity index after one project changed
+
+    Only the changed project is compared with its candidates. Other lists
+    are patched in place, and a full recompute happens only for projects
+    whose list may have lost this project to something outside it.
+    """
+    candidates = recompute_neighbours(project)
+    limit = get_neighbour_limit()
+
+    # Score of the changed project as seen from each candidate
+    own_weight = project_weight(project.status, project.is_featured)
+    incoming = {}
+    if project.is_public:
+        incoming = {
+            pk: similarity * own_weight
+            for pk, (similarity, _, _) in candidates.items() if similarity
+        }
+
+    holders = dict(
+        RelatedProject.objects.filter(related_id=project.pk).values_list('project_id', 'score')
+    )
+    stale = []
+    for holder_id, old_score in holders.items():
+        new_score = incoming.pop(holder_id, None)
+        if new_score is None or new_score < old_score:
+            stale.append(holder_id)
+        elif new_score != old_score:
+            RelatedProject.objects.filter(project_id=holder_id, related_id=project.pk).update(score=new_score)
+
+    # Insert into lists the project now qualifies for
+    ids = list(incoming)
+    for start in range(0, len(ids), CHUNK_SIZE):
+        chunk = ids[start:start + CHUNK_SIZE]
+        floors = {
+            row['project_id']: row for row in
+            RelatedProject.objects.filter(project_id__in=chunk)
+            .values('project_id')
+            .annotate(count=Count('id'), floor=Min('score'))
+        }
+        for candidate_id in chunk:
+            score = incoming[candidate_id]
+            floor = floors.get(candidate_id)
+            if floor and floor['count'] >= limit and score <= floor['floor']:
+                continue
+            RelatedProject.objects.create(project_id=candidate_id, related_id=project.pk, score=score)
+            if floor and floor['count'] >= limit:
+                lowest = RelatedProject.objects.filter(project_id=candidate_id).order_by('score').first()
+                lowest.delete()
+
+    for holder in Project.objects.filter(pk__in=stale):
+        recompute_neighbours(holder)
+
+def refill_holders(holder_ids):
+    """Recompute lists that referenced a deleted project"""
+    for holder in Project.objects.filter(pk__in=holder_ids):
+        recompute_neighbours(holder)
+
+def rebuild_related_projects():
+    """Recompute every project's neighbour list"""
+    count = 0
+    for project in Project.objects.all().iterator(chunk_size=500):
+        recompute_neighbours(project)
+        count += 1
+    return count
@@ -0,0 +1,209 @@
+from django.conf import settings
+from django.db import connection, DatabaseError
+from django.db.models import Case, When, Q, IntegerField
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+import logging
+import re
+import uuid
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+def tokenize_query(query):
+    """Split a user query into plain search terms"""
+    return TOKEN_RE.findall(query.lower())[:16]
+
+class IcontainsSearchBackend:
+    """Unindexed substring search, used when no full-text index is available"""
+
+    def ensure_index(self):
+        pass
+
+    def index_project(self, project):
+        self.index_projects([project])
+
+    def index_projects(self, projects):
+        pass
+
+    def remove_project(self, project_id):
+        pass
+
+    def rebuild(self, projects):
+        return 0
+
+    def search(self, query, queryset):
+        return queryset.filter(
+            Q(title__icontains=query) |
+            Q(description__icontains=query) |
+            Q(frameworks__icontains=query)
+        )
+
+class RankedSearchBackend(IcontainsSearchBackend):
+    """Base class for backends returning project ids in relevance order"""
+    table = 'main_project_search'
+
+    def search_ids(self, terms, limit):
+        raise NotImplementedError
+
+    def search(self, query, queryset):
+        terms = tokenize_query(query)
+        if not terms:
+            return queryset.none()
+
+        limit = getattr(settings, 'SEARCH_MAX_RESULTS', 500)
+        try:
+            ids = self.search_ids(terms, limit)
+        except DatabaseError as e:
+            logger.warning(f"Full-text search failed, using icontains: {e}")
+            return super().search(query, queryset)
+
+        if not ids:
+            return queryset.none()
+        return queryset.filter(pk__in=ids).order_by(self.rank_expression(ids))
+
+    def rank_expression(self, ids):
+        """Return an expression ordering rows by their position in ids"""
+        return Case(
+            *[When(pk=pk, then=position) for position, pk in enumerate(ids)],
+            output_field=IntegerField()
+        )
+
+    def rebuild(self, projects):
+        self.ensure_index()
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+        count = 0
+        batch = []
+        for project in projects.only('pk', 'title', 'description', 'frameworks').iterator(chunk_size=1000):
+            batch.append(project)
+            if len(batch) >= 1000:
+                self.index_projects(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self.index_projects(batch)
+            count += len(batch)
+        return count
+
+class SQLiteSearchBackend(RankedSearchBackend):
+    """SQLite FTS5 index ranked with bm25"""
+    table = 'main_project_fts'
+
+    def ensure_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5('
+                'project_id UNINDEXED, title, description, frameworks, '
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+
+    @staticmethod
+    def rowid(project_id):
+        # FTS5 can only look rows up quickly by rowid, so derive one from the UUID
+        return project_id.int & (2 ** 63 - 1)
+
+    def index_projects(self, projects):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {self.table} (rowid, project_id, title, description, frameworks) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [[self.rowid(project.pk), project.pk.hex, project.title,
+                  project.description, project.frameworks]
+                 for project in projects]
+            )
+
+    def remove_project(self, project_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [self.rowid(project_id)])
+
+    def rank_expression(self, ids):
+        # A single instr() call is far cheaper than a CASE with hundreds of branches
+        return RawSQL('instr(%s, "main_project"."id")', [','.join(pk.hex for pk in ids)])
+
+    def search_ids(self, terms, limit):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        with connection.cursor() as cursor:
+            # Column weights: title, description, frameworks
+            cursor.execute(
+                f'SELECT project_id FROM {self.table} WHERE {self.table} MATCH %s '
+                f'ORDER BY bm25({self.table}, 0.0, 10.0, 1.0, 5.0) LIMIT %s',
+                [match, limit]
+            )
+            return [uuid.UUID(row[0]) for row in cursor.fetchall()]
+
+class PostgresSearchBackend(RankedSearchBackend):
+    """PostgreSQL tsvector index with a GIN index, ranked with ts_rank"""
+    config = 'english'
+
+    def ensure_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} ('
+                'project_id uuid PRIMARY KEY REFERENCES main_project (id) ON DELETE CASCADE, '
+                'document tsvector NOT NULL)'
+            )
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {self.table}_document_gin '
+                f'ON {self.table} USING GIN (document)'
+            )
+
+    def index_projects(self, projects):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (project_id, document) VALUES (%s, '
+                'setweight(to_tsvector(%s, %s), \'A\') || '
+                'setweight(to_tsvector(%s, %s), \'B\') || '
+                'setweight(to_tsvector(%s, %s), \'C\')) '
+                'ON CONFLICT (project_id) DO UPDATE SET document = EXCLUDED.document',
+                [[project.pk,
+                  self.config, project.title,
+                  self.config, project.frameworks,
+                  self.config, project.description]
+                 for project in projects]
+            )
+
+    def remove_project(self, project_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE project_id = %s', [project_id])
+
+    def rank_expression(self, ids):
+        return RawSQL('array_position(%s::uuid[], "main_project"."id")', [list(ids)])
+
+    def search_ids(self, terms, limit):
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT project_id FROM {self.table}, to_tsquery(%s, %s) query '
+                'WHERE document @@ query ORDER BY ts_rank(document, query) DESC LIMIT %s',
+                [self.config, tsquery, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+_backend = None
+
+def get_search_backend():
+    """Return the search backend for the default database
+
+    SQLite gets an FTS5 index, PostgreSQL a tsvector/GIN index and other
+    databases fall back to icontains. SEARCH_BACKEND overrides the choice.
+    """
+    global _backend
+    if _backend is None:
+        backend_path = getattr(settings, 'SEARCH_BACKEND', None)
+        if backend_path:
+            backend_class = import_string(backend_path)
+        else:
+            backend_class = BACKENDS.get(connection.vendor, IcontainsSearchBackend)
+        _backend = backend_class()
+    return _backend
+
+def search_projects(query, queryset):
+    """Filter a project queryset by a search query, best matches first"""
+    return get_search_backend().search(query, queryset)
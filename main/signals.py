@@ -0,0 +1,125 @@
+from django.db import transaction, DatabaseError
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from .cache import bump_content_version, invalidate_fragment
+from .context_processors import invalidate_about
+from .gallery import gallery_measured, schedule_gallery_sync
+from .icons import invalidate_icon_matcher
+from .images import delete_variant_files, schedule_variants, variant_files, variants_ready
+from .models import About, Experience, GalleryImage, Project, RelatedProject, Skill
+from .related import refill_holders
+from .search import get_search_backend
+from .sitemap_files import schedule_sitemap_update
+import logging
+
+logger = logging.getLogger(__name__)
+
+@receiver([post_save, post_delete], sender=About)
+@receiver([post_save, post_delete], sender=Experience)
+@receiver([post_save, post_delete], sender=Skill)
+@receiver([post_save, post_delete], sender=Project)
+def invalidate_page_cache(sender, **kwargs):
+    """Drop cached pages whenever content shown on them changes"""
+    bump_content_version()
+
+@receiver([post_save, post_delete], sender=About)
+def invalidate_owner(sender, **kwargs):
+    """Reload the cached About in every process"""
+    invalidate_about()
+
+@receiver([post_save, post_delete], sender=Skill)
+def invalidate_skill_icons(sender, **kwargs):
+    """Rebuild the skill icon matcher in every process"""
+    invalidate_icon_matcher()
+
+@receiver([post_save, post_delete], sender=Project)
+def invalidate_project_card(sender, instance, **kwargs):
+    """Drop the cached cards of a saved or deleted project, on every page"""
+    invalidate_fragment('project', instance.pk)
+
+@receiver([post_save, post_delete], sender=Project)
+def update_project_sitemap(sender, instance, **kwargs):
+    """Rewrite the pre-built sitemap shard that lists this project"""
+    schedule_sitemap_update(instance.pk)
+
+@receiver(post_save, sender=About)
+@receiver(post_save, sender=Project)
+def resize_uploaded_images(sender, instance, **kwargs):
+    """Make resized copies of new images, or drop those of removed ones, in the background"""
+    for field in getattr(instance, '_changed_images', ()):
+        schedule_variants(instance, field)
+    instance._changed_images = []
+
+@receiver(post_delete, sender=About)
+@receiver(post_delete, sender=Project)
+def delete_image_variants(sender, instance, **kwargs):
+    """Remove the resized copies of a deleted row's images once the delete commits"""
+    names = [
+        name for field in instance.image_fields
+        for name in variant_files(getattr(instance, f'{field}_variants'))
+    ]
+    if names:
+        # A rolled-back delete brings the row back, and it still needs them
+        transaction.on_commit(lambda: delete_variant_files(names))
+
+@receiver(variants_ready, sender=Project)
+def show_project_variants(sender, pk, **kwargs):
+    """Re-render pages and the card of a project whose copies are ready"""
+    bump_content_version()
+    invalidate_fragment('project', pk)
+
+@receiver(variants_ready, sender=About)
+def show_about_variants(sender, **kwargs):
+    """Reload About, whose copies are ready, in every process"""
+    bump_content_version()
+    invalidate_about()
+
+@receiver(post_save, sender=Project)
+def sync_project_gallery(sender, instance, **kwargs):
+    """Keep gallery rows in step with gallery_images and measure new images in the background"""
+    try:
+        with transaction.atomic():
+            schedule_gallery_sync(instance)
+    except DatabaseError as e:
+        logger.error(f"Error syncing gallery of project {instance.pk}: {e}")
+
+@receiver(gallery_measured, sender=GalleryImage)
+def show_gallery_sizes(sender, **kwargs):
+    """Re-render detail pages once their gallery images are measured"""
+    bump_content_version()
+
+@receiver(post_save, sender=Project)
+def index_project(sender, instance, **kwargs):
+    """Keep the full-text search index in sync with saved projects"""
+    try:
+        with transaction.atomic():
+            get_search_backend().index_project(instance)
+    except DatabaseError as e:
+        logger.error(f"Error indexing project {instance.pk}: {e}")
+
+@receiver(post_delete, sender=Project)
+def unindex_project(sender, instance, **kwargs):
+    """Remove deleted projects from the full-text search index"""
+    try:
+        with transaction.atomic():
+            get_search_backend().remove_project(instance.pk)
+    except DatabaseError as e:
+        logger.error(f"Error removing project {instance.pk} from search index: {e}")
+
+@receiver(pre_delete, sender=Project)
+def remember_related_holders(sender, instance, **kwargs):
+    """Note which neighbour lists will lose this project"""
+    instance._related_holders = list(
+        RelatedProject.objects.filter(related=instance).values_list('project_id', flat=True)
+    )
+
+@receiver(post_delete, sender=Project)
+def refill_related_projects(sender, instance, **kwargs):
+    """Refill neighbour lists that pointed at a deleted project"""
+    holders = getattr(instance, '_related_holders', None)
+    if holders:
+        refill_holders(holders)
+
+def create_search_index(sender, **kwargs):
+    """Create the full-text search index after migrations"""
+    get_search_backend().ensure_index()
@@ -0,0 +1,177 @@
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+from django.utils.xmlutils import SimplerXMLGenerator
+from contextlib import contextmanager
+from pathlib import Path
+from .models import Project
+from .sitemaps import StaticViewSitemap, ProjectSitemap
+import gzip
+import io
+import json
+import logging
+import math
+import os
+import threading
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+MANIFEST = 'manifest.json'
+# Shards are sized for this share of the limit, so they have room to grow
+# before one overflows and the whole set is re-sharded
+SHARD_FILL = 0.8
+
+def sitemap_root():
+    return Path(settings.SITEMAP_ROOT)
+
+def sitemaps_built():
+    """Whether build_sitemaps has run, which turns on incremental updates"""
+    return (sitemap_root() / MANIFEST).exists()
+
+_thread_lock = threading.Lock()
+
+@contextmanager
+def _locked(root):
+    """Serialize writers across threads, and across worker processes where flock exists"""
+    with _thread_lock, open(root / '.lock', 'a') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+def _replace(path, content):
+    temporary = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    temporary.write_bytes(content)
+    os.replace(temporary, path)
+
+def _write(path, data):
+    """Write data and a gzipped copy next to it, each replaced atomically"""
+    _replace(path, data)
+    _replace(path.with_name(path.name + '.gz'), gzip.compress(data, mtime=0))
+
+def _render(root_tag, entries):
+    """Render (tag, {child: text}) entries as a sitemap XML document"""
+    stream = io.StringIO()
+    xml = SimplerXMLGenerator(stream, 'utf-8')
+    xml.startDocument()
+    xml.startElement(root_tag, {'xmlns': SITEMAP_NS})
+    for tag, children in entries:
+        xml.startElement(tag, {})
+        for name, text in children.items():
+            if text is not None:
+                xml.addQuickElement(name, text)
+        xml.endElement(tag)
+    xml.endElement(root_tag)
+    xml.endDocument()
+    return stream.getvalue().encode('utf-8')
+
+def _shard_bounds(shard, shards):
+    """Primary key range of a shard; ids are spread evenly over the UUID space"""
+    low = uuid.UUID(int=(shard << 128) // shards)
+    high = uuid.UUID(int=((shard + 1) << 128) // shards) if shard + 1 < shards else None
+    return low, high
+
+def shard_for(project_id, shards):
+    return (project_id.int * shards) >> 128
+
+def _project_entries(shard, shards, base_url):
+    low, high = _shard_bounds(shard, shards)
+    queryset = Project.objects.filter(is_public=True, id__gte=low)
+    if high is not None:
+        queryset = queryset.filter(id__lt=high)
+    # Reverse once and substitute ids, rather than once per project
+    placeholder = uuid.UUID(int=0)
+    prefix, suffix = reverse('main:project_detail', args=[placeholder]).split(str(placeholder))
+    changefreq, priority = ProjectSitemap.changefreq, str(ProjectSitemap.priority)
+    for project_id, updated_at in queryset.order_by('id').values_list('id', 'updated_at').iterator(chunk_size=5000):
+        yield updated_at, ('url', {
+            'loc': f'{base_url}{prefix}{project_id}{suffix}',
+            'lastmod': updated_at.date().isoformat(),
+            'changefreq': changefreq,
+            'priority': priority,
+        })
+
+def _write_shard(root, shard, shards, base_url):
+    """Write one project shard; return (url count, newest lastmod)"""
+    entries, newest = [], None
+    for updated_at, entry in _project_entries(shard, shards, base_url):
+        entries.append(entry)
+        newest = max(newest, updated_at) if newest else updated_at
+    _write(root / f'sitemap-projects-{shard}.xml', _render('urlset', entries))
+    return len(entries), newest.isoformat() if newest else None
+
+def _write_index(root, manifest):
+    base_url = manifest['base_url']
+    entries = [('sitemap', {'loc': f'{base_url}/sitemap-static.xml'})]
+    for shard, lastmod in enumerate(manifest['lastmod']):
+        entries.append(('sitemap', {'loc': f'{base_url}/sitemap-projects-{shard}.xml', 'lastmod': lastmod}))
+    _write(root / 'sitemap.xml', _render('sitemapindex', entries))
+    _replace(root / MANIFEST, json.dumps(manifest, indent=2).encode('utf-8'))
+
+def build_sitemaps(base_url=None, shard_size=None):
+    """Write the whole sitemap set to SITEMAP_ROOT; return the manifest
+
+    sitemap.xml is an index of sitemap-static.xml and the project shards.
+    Every file gets a .xml.gz twin for nginx's gzip_static.
+    """
+    base_url = (base_url or settings.SITE_URL).rstrip('/')
+    shard_size = shard_size or settings.SITEMAP_SHARD_SIZE
+    root = sitemap_root()
+    root.mkdir(parents=True, exist_ok=True)
+    with _locked(root):
+        static = StaticViewSitemap()
+        _write(root / 'sitemap-static.xml', _render('urlset', [
+            ('url', {'loc': f'{base_url}{static.location(item)}', 'changefreq': static.changefreq,
+                     'priority': str(static.priority)})
+            for item in static.items()
+        ]))
+
+        count = Project.objects.filter(is_public=True).count()
+        shards = max(1, math.ceil(count / (shard_size * SHARD_FILL)))
+        manifest = {'base_url': base_url, 'shard_size': shard_size, 'shards': shards, 'urls': [], 'lastmod': []}
+        for shard in range(shards):
+            urls, lastmod = _write_shard(root, shard, shards, base_url)
+            manifest['urls'].append(urls)
+            manifest['lastmod'].append(lastmod)
+        # Shards left over from a larger set
+        for stale in root.glob('sitemap-projects-*.xml*'):
+            if int(stale.name.split('-')[2].split('.')[0]) >= shards:
+                stale.unlink()
+        _write_index(root, manifest)
+    return manifest
+
+def update_sitemap_for(project_id):
+    """Rewrite the shard holding project_id, and the index; no-op until built once"""
+    root = sitemap_root()
+    if not sitemaps_built():
+        return
+    with _locked(root):
+        manifest = json.loads((root / MANIFEST).read_text(encoding='utf-8'))
+        shards = manifest['shards']
+        shard = shard_for(project_id, shards)
+        urls, lastmod = _write_shard(root, shard, shards, manifest['base_url'])
+        manifest['urls'][shard] = urls
+        manifest['lastmod'][shard] = lastmod
+        _write_index(root, manifest)
+    if urls > manifest['shard_size']:
+        logger.info(f'Sitemap shard {shard} holds {urls} URLs; re-sharding')
+        build_sitemaps(manifest['base_url'], manifest['shard_size'])
+
+def schedule_sitemap_update(project_id):
+    """Update the project's shard once the current transaction commits"""
+    def update():
+        try:
+            update_sitemap_for(project_id)
+        except Exception as e:
+            logger.error(f"Error updating sitemap for project {project_id}: {e}")
+    transaction.on_commit(update)
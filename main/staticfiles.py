@@ -0,0 +1,209 @@
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.contrib.staticfiles.utils import matches_patterns
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from pathlib import Path
+import gzip
+import logging
+import re
+
+try:
+    import brotli
+except ImportError:  # optional; only gzip siblings are written without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESS_PATTERNS = ('*.css', '*.js', '*.svg', '*.json', '*.map', '*.txt', '*.xml', '*.html', '*.ico')
+# Below this, the gzip header costs more than it saves
+COMPRESS_MIN_SIZE = 256
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}(?=\.[^./]+$)')
+
+CSS_TOKENS = re.compile(r'''
+    (?P<comment>/\*.*?\*/)
+  | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<space>\s+)
+''', re.VERBOSE | re.DOTALL)
+
+# A '/' after one of these characters, or after return, starts a regex
+# literal rather than a division
+JS_TOKENS = re.compile(r'''
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'|`(?:[^`\\]|\\.)*`)
+  | (?P<regex>(?:(?<=[(,=:\[!&|?{};])|(?<=\breturn))[ \t]*
+               /(?![/*])(?:[^/\\\n\[]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-z]*)
+  | (?P<space>\s+)
+''', re.VERBOSE | re.DOTALL)
+
+def _minify(source, tokens, space_before, space_after, newline_before=None, newline_after=None,
+            drop_before=None):
+    """Drop comments and collapse whitespace, leaving strings untouched
+
+    A run of whitespace disappears when the character after it is in
+    space_before or the one before it is in space_after; otherwise it
+    becomes one space. With the newline_* sets given, a run holding a line
+    break is kept as one newline unless those sets say it is safe to drop,
+    so automatic semicolon insertion sees the same line breaks.
+    drop_before maps a character to one that is redundant right before it
+    (';' before '}' in CSS); only code is touched, never a string.
+    """
+    parts, pending, position = [], '', 0
+    last_is_code = False
+
+    def emit(text, code=True):
+        nonlocal pending, last_is_code
+        if code and drop_before:
+            for closing, dropped in drop_before.items():
+                text = text.replace(dropped + closing, closing)
+                if text.startswith(closing) and last_is_code and parts[-1].endswith(dropped):
+                    parts[-1] = parts[-1][:-1]
+                    if not parts[-1]:
+                        parts.pop()
+        if pending and parts:
+            last, following = parts[-1][-1], text[0]
+            if newline_before is not None and '\n' in pending:
+                if last not in newline_after and following not in newline_before:
+                    parts.append('\n')
+            elif last not in space_after and following not in space_before:
+                parts.append(' ')
+        pending = ''
+        parts.append(text)
+        last_is_code = code
+
+    for match in tokens.finditer(source):
+        if match.start() > position:
+            emit(source[position:match.start()])
+        position = match.end()
+        kind, text = match.lastgroup, match.group()
+        if kind == 'space':
+            pending += text
+        elif kind == 'comment':
+            # A comment still separates the tokens around it
+            pending += '\n' if '\n' in text else ' '
+        elif kind == 'regex':
+            stripped = text.lstrip()
+            pending += text[:len(text) - len(stripped)]
+            emit(stripped, code=False)
+        else:
+            emit(text, code=False)
+    if position < len(source):
+        emit(source[position:])
+    return ''.join(parts)
+
+def minify_css(source):
+    """Strip comments and insignificant whitespace from a stylesheet"""
+    return _minify(source, CSS_TOKENS, '{};,>)', '{};,>:(', drop_before={'}': ';'})
+
+def minify_js(source):
+    """Strip comments and indentation from a script
+
+    Line breaks are kept wherever dropping one could change how the
+    script parses, so the output runs exactly like the input.
+    """
+    punctuation = '{}()[];,:=<>!&|?*%'
+    return _minify(
+        source, JS_TOKENS, punctuation + '.', punctuation,
+        newline_before='}()[];,:=<>&|?*%.', newline_after='{([;,:=<>!&|?*%',
+    )
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+def _minifier(name):
+    if '.min.' in name:
+        return None
+    return MINIFIERS.get(name[name.rfind('.'):])
+
+def _project_static_dirs():
+    """Resolved STATICFILES_DIRS, which hold the site's own assets"""
+    return {
+        Path(root[1] if isinstance(root, (list, tuple)) else root).resolve()
+        for root in settings.STATICFILES_DIRS
+    }
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Hashed file names plus minified CSS/JS and precompressed siblings
+
+    The site's own stylesheets and scripts are minified; files shipped by
+    apps (the admin's) are already small or minified and are copied as they
+    are. Every compressible file gets a .gz sibling, and a .br one when
+    the brotli package is installed, for nginx's gzip_static.
+    """
+
+    # favicon.ico and other optional files may be missing; link them by
+    # their plain name instead of failing the page
+    manifest_strict = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.minified_paths = set()
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def _save(self, name, content):
+        minify = _minifier(name)
+        if minify and HASHED_NAME.sub('', name) in self.minified_paths:
+            content.seek(0)
+            content = ContentFile(minify(content.read().decode('utf-8')).encode('utf-8'))
+        return super()._save(name, content)
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run, **options)
+            return
+        own = _project_static_dirs()
+        self.minified_paths = {
+            path for path, (storage, source) in paths.items()
+            if _minifier(path) and Path(storage.location).resolve() in own
+        }
+        for path in self.minified_paths:
+            # collectstatic copied these verbatim; replace them too, since
+            # the unhashed names remain reachable
+            storage, source = paths[path]
+            with storage.open(source) as original:
+                self.delete(path)
+                self._save(path, original)
+        yield from super().post_process(paths, dry_run, **options)
+        self.compress_all(paths)
+
+    def compress(self, name):
+        """Write compressed siblings of name; return the gzipped size"""
+        with self.open(name) as original:
+            data = original.read()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return len(data)
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        self._write_sibling(name + '.gz', compressed)
+        if brotli is not None:
+            self._write_sibling(name + '.br', brotli.compress(data))
+        return min(len(compressed), len(data))
+
+    def _write_sibling(self, name, data):
+        if self.exists(name):
+            self.delete(name)
+        # Through the base class; siblings are never minified or hashed
+        FileSystemStorage._save(self, name, ContentFile(data))
+
+    def compress_all(self, paths):
+        """Compress the files served under hashed names and log the bytes saved"""
+        source_bytes = served_bytes = gzip_bytes = files = 0
+        for path, (storage, source) in paths.items():
+            hashed_name = self.hashed_files.get(self.hash_key(self.clean_name(path)))
+            if not hashed_name or not matches_patterns(path, COMPRESS_PATTERNS):
+                continue
+            self.compress(path)
+            files += 1
+            source_bytes += storage.size(source)
+            served_bytes += self.size(hashed_name)
+            gzip_bytes += self.compress(hashed_name)
+        if files:
+            saved = source_bytes - gzip_bytes
+            logger.info(
+                f"Static assets: {files} files, {source_bytes} bytes as written, "
+                f"{served_bytes} minified, {gzip_bytes} gzipped; "
+                f"{saved} bytes ({saved * 100 // source_bytes}%) saved per full download"
+            )
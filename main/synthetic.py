@@ -0,0 +1,261 @@
+from datetime import date, timedelta
+from django.db import transaction
+from django.db.models import Max
+from .images import delete_variant_files, variant_files
+from .models import (
+    About, Experience, Project, ContactMessage, Skill, GalleryImage, RelatedProject,
+    MarkdownFieldsMixin, sync_technologies_bulk,
+)
+import itertools
+import random
+import re
+import time
+import uuid
+
+WORDS = [
+    'telegram', 'bot', 'payment', 'gateway', 'machine', 'learning', 'pipeline', 'analytics',
+    'dashboard', 'scraper', 'recommendation', 'inventory', 'booking', 'chat', 'realtime',
+    'monitoring', 'classifier', 'vision', 'api', 'automation', 'ecommerce', 'crm', 'billing',
+    'search', 'notification', 'scheduler', 'portal', 'marketplace', 'forecast', 'translation',
+]
+FRAMEWORKS = [
+    'Python', 'Django', 'DRF', 'PostgreSQL', 'Docker', 'Redis', 'Celery', 'Aiogram', 'FastAPI',
+    'TensorFlow', 'Pandas', 'NumPy', 'React', 'Telebot', 'Flask', 'PyTorch', 'Kubernetes', 'Vue',
+    'Scikit-learn', 'Airflow', 'Nginx', 'Git', 'Linux', 'AWS',
+]
+SKILL_CATEGORIES = {
+    'Python': 'programming', 'Django': 'framework', 'DRF': 'framework', 'PostgreSQL': 'database',
+    'Docker': 'cloud', 'Redis': 'database', 'Celery': 'tool', 'Aiogram': 'framework',
+    'FastAPI': 'framework', 'TensorFlow': 'ai_ml', 'Pandas': 'ai_ml', 'NumPy': 'ai_ml',
+    'React': 'framework', 'Telebot': 'framework', 'Flask': 'framework', 'PyTorch': 'ai_ml',
+    'Kubernetes': 'cloud', 'Vue': 'framework', 'Scikit-learn': 'ai_ml', 'Airflow': 'tool',
+    'Nginx': 'tool', 'Git': 'tool', 'Linux': 'tool', 'AWS': 'cloud',
+}
+COMPANIES = ['Tech Solutions', 'DataTech', 'Payme', 'Uzum', 'EPAM', 'Click', 'Humans', 'Beeline']
+ROLES = ['Backend Developer', 'AI/ML Engineer', 'Bot Developer', 'Data Engineer', 'Team Lead']
+FIRST_NAMES = ['Aziz', 'Dilnoza', 'Bekzod', 'Malika', 'Jasur', 'Nodira', 'Timur', 'Anna', 'John']
+STATUS_WEIGHTS = {'completed': 6, 'development': 2, 'maintenance': 1, 'planning': 1, 'archived': 1}
+EXPERIENCE_WEIGHTS = {'work': 6, 'education': 1, 'certification': 2, 'volunteer': 1, 'freelance': 2}
+PRIORITY_WEIGHTS = {'low': 2, 'medium': 6, 'high': 2, 'urgent': 1}
+
+def _cumulative(weights):
+    return list(weights), list(itertools.accumulate(weights.values()))
+
+STATUSES = _cumulative(STATUS_WEIGHTS)
+EXPERIENCE_TYPES = _cumulative(EXPERIENCE_WEIGHTS)
+PRIORITIES = _cumulative(PRIORITY_WEIGHTS)
+
+def parse_frameworks(spec, exponent=1.0):
+    """Return (names, cumulative weights) for a framework vocabulary
+
+    spec is either 'zipf', 'uniform', or 'Name:weight,Name:weight,...'.
+    Zipf ranks follow FRAMEWORKS, so Python and Django are the most common.
+    """
+    if spec == 'uniform':
+        names, weights = FRAMEWORKS, [1.0] * len(FRAMEWORKS)
+    elif spec == 'zipf':
+        names = FRAMEWORKS
+        weights = [1 / (rank + 1) ** exponent for rank in range(len(FRAMEWORKS))]
+    else:
+        names, weights = [], []
+        try:
+            for item in spec.split(','):
+                name, _, weight = item.partition(':')
+                if name.strip():
+                    names.append(name.strip())
+                    weights.append(float(weight) if weight else 1.0)
+        except ValueError:
+            names = []
+        if not names or min(weights) < 0 or not sum(weights):
+            raise ValueError(f'Invalid framework distribution: {spec!r}')
+    return list(names), list(itertools.accumulate(weights))
+
+class SyntheticData:
+    """Deterministic generators of portfolio rows
+
+    Every generator is lazy, so callers can stream millions of rows without
+    holding them in memory. Row i of a model always gets the same id and
+    content for a given seed, however the run is batched, so runs that
+    continue numbering after existing rows never collide with earlier ones.
+    """
+
+    def __init__(self, seed=42, frameworks='zipf', exponent=1.0, today=None):
+        self.seed = seed
+        self.frameworks, self.framework_weights = parse_frameworks(frameworks, exponent)
+        self.today = today or date.today()
+        self.namespace = uuid.uuid5(uuid.NAMESPACE_URL, f'synthetic:{seed}')
+
+    def random(self, kind, i):
+        """Generator for row i alone, so a row never depends on how a run is batched"""
+        return random.Random(f'{self.seed}:{kind}:{i}')
+
+    def uuid(self, kind, i):
+        return uuid.uuid5(self.namespace, f'{kind}:{i}')
+
+    @staticmethod
+    def next_index(model):
+        """Index after the highest synthetic row of model, so new rows reuse no id or slug
+
+        Rows are recognised by the index every generator writes into one
+        field. A hand-entered row that happens to match only moves the start
+        further on, which leaves a harmless gap.
+        """
+        if model is Skill:
+            top = model.objects.aggregate(top=Max('order'))['top']
+            return 0 if top is None else top + 1
+        field, pattern = INDEX_FIELDS[model]
+        top = -1
+        for value in model.objects.filter(**{f'{field}__regex': pattern.pattern}).values_list(field, flat=True).iterator():
+            top = max(top, int(pattern.fullmatch(value).group(1)))
+        return top + 1
+
+    def pick(self, rng, choices):
+        names, cum_weights = choices
+        return rng.choices(names, cum_weights=cum_weights)[0]
+
+    def text(self, rng, words):
+        return ' '.join(rng.choices(WORDS, k=words)).capitalize() + '.'
+
+    def framework_sample(self, rng, low=2, high=6):
+        """Distinct frameworks drawn from the configured distribution"""
+        count = min(rng.randint(low, high), len(self.frameworks))
+        chosen = []
+        while len(chosen) < count:
+            name = rng.choices(self.frameworks, cum_weights=self.framework_weights)[0]
+            if name not in chosen:
+                chosen.append(name)
+        return chosen
+
+    def about(self):
+        rng = self.random('about', 0)
+        return About(
+            id=self.uuid('about', 0),
+            skills=', '.join(self.framework_sample(rng, 8, 12)),
+            years_of_experience=rng.randint(1, 10),
+        )
+
+    def projects(self, count, start=0):
+        for i in range(start, start + count):
+            rng = self.random('project', i)
+            started = self.today - timedelta(days=rng.randint(30, 3000))
+            status = self.pick(rng, STATUSES)
+            yield Project(
+                id=self.uuid('project', i),
+                title=' '.join(rng.sample(WORDS, 3)).title(),
+                slug=f'synthetic-{i}',
+                description=self.text(rng, rng.randint(20, 60)),
+                detailed_description=self.text(rng, rng.randint(80, 200)),
+                frameworks=', '.join(self.framework_sample(rng)),
+                github_link=f'https://github.com/example/project-{i}',
+                status=status,
+                start_date=started,
+                end_date=started + timedelta(days=rng.randint(14, 400)) if status == 'completed' else None,
+                team_size=rng.randint(1, 8),
+                is_featured=rng.random() < 0.05,
+                is_public=rng.random() < 0.95,
+                order=rng.randint(0, 100),
+            )
+
+    def experiences(self, count, start=0):
+        for i in range(start, start + count):
+            rng = self.random('experience', i)
+            started = self.today - timedelta(days=rng.randint(30, 5000))
+            current = rng.random() < 0.1
+            yield Experience(
+                id=self.uuid('experience', i),
+                title=rng.choice(ROLES),
+                company_or_institution=f'{rng.choice(COMPANIES)} {i}',
+                location='Tashkent, Uzbekistan',
+                start_date=started,
+                end_date=None if current else started + timedelta(days=rng.randint(90, 1500)),
+                is_current=current,
+                description=self.text(rng, rng.randint(20, 50)),
+                experience_type=self.pick(rng, EXPERIENCE_TYPES),
+                order=rng.randint(0, 10),
+                skills_used=', '.join(self.framework_sample(rng, 2, 5)),
+                achievements=self.text(rng, rng.randint(10, 30)),
+            )
+
+    def skills(self, count, start=0):
+        for i in range(start, start + count):
+            rng = self.random('skill', i)
+            base = self.frameworks[i % len(self.frameworks)]
+            # Names are unique; the vocabulary repeats with a numeric suffix
+            name = base if i < len(self.frameworks) else f'{base} {i // len(self.frameworks) + 1}'
+            yield Skill(
+                id=self.uuid('skill', i),
+                name=name,
+                category=SKILL_CATEGORIES.get(base, 'other'),
+                proficiency=rng.choice(['beginner', 'intermediate', 'advanced', 'expert']),
+                years_of_experience=rng.randint(1, 10),
+                order=i,
+                is_featured=rng.random() < 0.2,
+            )
+
+    def messages(self, count, start=0):
+        for i in range(start, start + count):
+            rng = self.random('message', i)
+            name = rng.choice(FIRST_NAMES)
+            yield ContactMessage(
+                id=self.uuid('message', i),
+                name=f'{name} {i}',
+                email=f'{name.lower()}{i}@example.com',
+                subject=' '.join(rng.sample(WORDS, 3)).capitalize(),
+                message=self.text(rng, rng.randint(15, 80)),
+                priority=self.pick(rng, PRIORITIES),
+                is_read=rng.random() < 0.7,
+                ip_address=f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}',
+            )
+
+# The field and pattern that carry the row index i of each generator's rows
+INDEX_FIELDS = {
+    Project: ('slug', re.compile(r'^synthetic-([0-9]+)$')),
+    Experience: ('company_or_institution', re.compile(r'^.* ([0-9]+)$')),
+    ContactMessage: ('name', re.compile(r'^.* ([0-9]+)$')),
+}
+
+# Rows that point at each model and go with it
+DEPENDENTS = {
+    Project: (RelatedProject, GalleryImage, Project.technologies.through),
+}
+
+def clear_rows(model):
+    """Delete every row of model with one statement per table, sending no signals
+
+    Deleting row by row at millions of rows would load each one and rewrite
+    files per row. Image copies are removed here; the caller rebuilds the
+    search index, related projects, sitemaps and caches afterwards.
+    """
+    variant_names = []
+    for field in getattr(model, 'image_fields', ()):
+        rows = model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+        for variants in rows.values_list(f'{field}_variants', flat=True).iterator():
+            variant_names += variant_files(variants)
+    with transaction.atomic():
+        for dependent in DEPENDENTS.get(model, ()):
+            dependent.objects.all()._raw_delete(dependent.objects.db)
+        count = model.objects.all()._raw_delete(model.objects.db)
+    delete_variant_files(variant_names)
+    return count
+
+def bulk_insert(model, rows, batch_size=1000, ignore_conflicts=False):
+    """Insert an iterable of unsaved rows in chunks; yield (inserted, seconds) per chunk
+
+    Rows bypass save(), so their markdown HTML and project technology links
+    are written here; the search index and related projects are rebuilt by
+    the caller.
+    """
+    rows = iter(rows)
+    while True:
+        start = time.perf_counter()
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        for obj in batch:
+            if isinstance(obj, MarkdownFieldsMixin):
+                obj.render_markdown_fields()
+        with transaction.atomic():
+            model.objects.bulk_create(batch, ignore_conflicts=ignore_conflicts)
+            if model is Project:
+                sync_technologies_bulk(batch)
+        yield len(batch), time.perf_counter() - start
@@ -1,6 +1,10 @@
 from django import template
-from django.utils.safestring import mark_safe
-import re
+from hashlib import md5
+from main.cache import render_fragment
+from main.fonts import web_fonts_built as fonts_built
+from main.icons import match_skill
+from main.images import picture_html
+from main.markup import highlight_code as highlight, render_markdown
 
 register = template.Library()
 
@@ -21,89 +25,17 @@ def trim(value):
 @register.filter
 def highlight_code(value):
     """Add syntax highlighting to code snippets"""
-    if not value:
-        return ''
-    
-    # Simple syntax highlighting for Python-like code
-    patterns = [
-        (r'\b(def|class|import|from|if|else|elif|for|while|try|except|finally|with|as|return|yield|break|continue|pass|lambda|global|nonlocal)\b', 
-         r'<span style="color: var(--terminal-blue);">\1</span>'),
-        (r'\b(True|False|None)\b', 
-         r'<span style="color: var(--terminal-purple);">\1</span>'),
-        (r'(#.*$)', 
-         r'<span style="color: var(--terminal-green);">\1</span>'),
-        (r'(["\'].*?["\'])', 
-         r'<span style="color: var(--warning-color);">\1</span>'),
-        (r'\b(\d+)\b', 
-         r'<span style="color: var(--terminal-orange);">\1</span>'),
-    ]
-    
-    result = str(value)
-    for pattern, replacement in patterns:
-        result = re.sub(pattern, replacement, result, flags=re.MULTILINE)
-    
-    return mark_safe(result)
+    return highlight(str(value)) if value else ''
 
 @register.filter
 def get_skill_icon(skill):
     """Get appropriate icon for a skill"""
-    skill_lower = str(skill).lower()
-    
-    icon_map = {
-        'python': 'fab fa-python',
-        'django': 'fas fa-server',
-        'tensorflow': 'fas fa-brain',
-        'ai': 'fas fa-brain',
-        'ml': 'fas fa-brain',
-        'machine learning': 'fas fa-brain',
-        'docker': 'fab fa-docker',
-        'git': 'fab fa-git-alt',
-        'github': 'fab fa-github',
-        'postgresql': 'fas fa-database',
-        'database': 'fas fa-database',
-        'telegram': 'fas fa-robot',
-        'bot': 'fas fa-robot',
-        'api': 'fas fa-plug',
-        'rest': 'fas fa-plug',
-        'javascript': 'fab fa-js',
-        'html': 'fab fa-html5',
-        'css': 'fab fa-css3-alt',
-        'react': 'fab fa-react',
-        'node': 'fab fa-node-js',
-        'linux': 'fab fa-linux',
-        'aws': 'fab fa-aws',
-        'redis': 'fas fa-memory',
-        'celery': 'fas fa-tasks',
-    }
-    
-    for key, icon in icon_map.items():
-        if key in skill_lower:
-            return icon
-    
-    return 'fas fa-code'
+    return match_skill(skill)[0]
 
 @register.filter
 def markdown_to_html(value):
     """Convert basic markdown to HTML"""
-    if not value:
-        return ''
-    
-    # Simple markdown conversion
-    result = str(value)
-    
-    # Bold text
-    result = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', result)
-    
-    # Italic text
-    result = re.sub(r'\*(.*?)\*', r'<em>\1</em>', result)
-    
-    # Code blocks
-    result = re.sub(r'`(.*?)`', r'<code>\1</code>', result)
-    
-    # Line breaks
-    result = result.replace('\n', '<br>')
-    
-    return mark_safe(result)
+    return render_markdown(value)
 
 @register.simple_tag
 def get_social_icon(platform):
@@ -122,15 +54,45 @@ def get_social_icon(platform):
     }
     return icons.get(platform.lower(), 'fas fa-link')
 
-@register.inclusion_tag('components/skill_card.html')
-def skill_card(skill, icon=None):
-    """Render a skill card component"""
-    return {
-        'skill': skill,
-        'icon': icon or get_skill_icon(skill),
-    }
+@register.simple_tag
+def responsive_image(image, variants, sizes='100vw', alt=''):
+    """Render an image with its resized copies as srcset, width and height"""
+    return picture_html(image, variants, sizes, alt)
+
+@register.simple_tag
+def web_fonts_built():
+    """Whether manage.py build_fonts has written the self-hosted fonts"""
+    return fonts_built()
+
+class FragmentNode(template.Node):
+    def __init__(self, nodelist, name, ident, stamp):
+        self.nodelist = nodelist
+        self.name = name
+        self.ident = ident
+        self.stamp = stamp
+        # Tells this markup apart from the same object's fragments on other pages
+        source = '\x00'.join(node.token.contents for node in nodelist.get_nodes_by_type(template.Node))
+        self.source = md5(source.encode('utf-8')).hexdigest()[:12]
+
+    def render(self, context):
+        return render_fragment(
+            self.name.resolve(context),
+            self.ident.resolve(context),
+            self.stamp.resolve(context) if self.stamp else None,
+            self.source,
+            lambda: self.nodelist.render(context),
+        )
+
+@register.tag
+def cache_fragment(parser, token):
+    """Cache the enclosed markup per object, shared by every page that renders it
 
-@register.inclusion_tag('components/project_card.html')
-def project_card(project):
-    """Render a project card component"""
-    return {'project': project}
+    {% cache_fragment 'project' project.pk project.updated_at %}...{% endcache_fragment %}
+    """
+    bits = token.split_contents()
+    if len(bits) not in (3, 4):
+        raise template.TemplateSyntaxError(f"'{bits[0]}' takes a name, an ident and an optional stamp")
+    name, ident, *stamp = (parser.compile_filter(bit) for bit in bits[1:])
+    nodelist = parser.parse(('endcache_fragment',))
+    parser.delete_first_token()
+    return FragmentNode(nodelist, name, ident, stamp[0] if stamp else None)
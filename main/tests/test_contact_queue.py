@@ -0,0 +1,50 @@
+from django.test import TestCase
+from main.contact_queue import ContactQueue
+from main.models import ContactMessage
+from pathlib import Path
+from unittest import mock
+import tempfile
+
+FIELDS = {'name': 'Ada', 'email': 'ada@example.com', 'subject': 'Hello', 'message': 'Hi there'}
+
+class ContactQueueRecoveryTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.spool_dir = Path(directory.name)
+
+    def start_queue(self):
+        # The flusher thread is driven by hand here instead
+        queue = ContactQueue(self.spool_dir)
+        with mock.patch('main.contact_queue.threading.Thread'), mock.patch('main.contact_queue.atexit'):
+            queue.start()
+        self.addCleanup(queue.spool.close)
+        return queue
+
+    def test_message_spooled_after_a_flush_survives_a_crash(self):
+        queue = self.start_queue()
+        queue.submit(dict(FIELDS, subject='First'))
+        queue.pending = [queue.queue.get_nowait()]
+        self.assertTrue(queue.flush())
+        queue.submit(dict(FIELDS, subject='Second'))
+
+        # Crash: the spool is left behind, unlocked, with the message unflushed
+        queue.spool.close()
+        self.assertFalse(queue.spool_path.read_bytes().startswith(b'\x00'))
+
+        replacement = self.start_queue()
+        replacement.recover()
+        self.assertEqual(replacement.stats['recovered'], 1)
+        self.assertTrue(ContactMessage.objects.filter(subject='Second').exists())
+        self.assertFalse(queue.spool_path.exists())
+
+    def test_recover_skips_bad_lines(self):
+        path = self.spool_dir / 'contact-1-abc.jsonl'
+        path.write_text('\x00\x00{"name": "Ada", "email": "ada@example.com", "subject": "Kept", '
+                        '"message": "Hi", "id": "6f1c2c8e-1d8e-4d55-a0a4-4f0c1a6c2a11"}\n'
+                        '{not json\n', encoding='utf-8')
+        queue = self.start_queue()
+        with self.assertLogs('main.contact_queue', 'ERROR'):
+            queue.recover()
+        self.assertTrue(ContactMessage.objects.filter(subject='Kept').exists())
+        self.assertFalse(path.exists())
@@ -0,0 +1,29 @@
+from django.core.management import call_command
+from django.test import TestCase
+from main.models import ContactMessage, Project, Skill
+from io import StringIO
+from unittest import mock
+
+class ContentTransferTests(TestCase):
+    def test_stdout_export_round_trips_through_import(self):
+        Skill.objects.create(name='Django')
+        Project.objects.create(title='Portfolio', description='A site\nover two lines',
+                               frameworks='Django, HTMX')
+        ContactMessage.objects.create(name='Ada', email='ada@example.com', subject='Hi', message='Hello')
+
+        exported = StringIO()
+        call_command('export_content', stdout=exported, stderr=StringIO())
+        lines = exported.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(all(lines))
+
+        Project.objects.all().delete()
+        Skill.objects.all().delete()
+        ContactMessage.objects.all().delete()
+        with mock.patch('sys.stdin', StringIO(exported.getvalue())):
+            call_command('import_content', '-', stdout=StringIO())
+
+        project = Project.objects.get()
+        self.assertEqual(project.description, 'A site\nover two lines')
+        self.assertEqual(Skill.objects.get().name, 'Django')
+        self.assertEqual(ContactMessage.objects.get().subject, 'Hi')
@@ -0,0 +1,26 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from main.cache import get_fragment_cache_key
+from main.models import Project
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(title='Portfolio', description='A site', frameworks='Django')
+
+    def test_listing_fills_the_fragment_cache(self):
+        response = self.client.get(reverse('main:projects'), secure=True)
+        self.assertContains(response, 'Portfolio')
+
+        renderings = cache.get(get_fragment_cache_key('project', self.project.pk))
+        self.assertEqual(len(renderings), 1)
+        (stamp, html), = renderings.values()
+        self.assertEqual(stamp, self.project.updated_at)
+        self.assertIn('<h3>Portfolio</h3>', html)
+
+    def test_saving_a_project_drops_its_fragments(self):
+        self.client.get(reverse('main:projects'), secure=True)
+        self.project.title = 'Renamed'
+        self.project.save()
+        self.assertIsNone(cache.get(get_fragment_cache_key('project', self.project.pk)))
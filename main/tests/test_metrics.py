@@ -0,0 +1,40 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from main.metrics import render_metrics
+from pathlib import Path
+from unittest import mock
+import json
+import tempfile
+
+class MetricsAccessTests(TestCase):
+    def test_without_a_token_only_direct_local_requests_are_served(self):
+        url = reverse('main:metrics')
+        self.assertEqual(self.client.get(url, secure=True).status_code, 200)
+        self.assertEqual(self.client.get(url, secure=True, REMOTE_ADDR='203.0.113.7').status_code, 403)
+        self.assertEqual(self.client.get(url, secure=True, HTTP_X_FORWARDED_FOR='203.0.113.7').status_code, 403)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token_is_required_when_set(self):
+        url = reverse('main:metrics')
+        self.assertEqual(self.client.get(url, secure=True).status_code, 403)
+        response = self.client.get(url, secure=True, REMOTE_ADDR='203.0.113.7',
+                                   HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+class MetricsSnapshotTests(TestCase):
+    def test_snapshots_of_exited_workers_are_removed(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        snapshot = {'counters': [['portfolio_requests_total', [['view', 'main:home']], 5]],
+                    'gauges': [], 'histograms': []}
+        live, dead = Path(directory.name) / 'metrics-101.json', Path(directory.name) / 'metrics-102.json'
+        live.write_text(json.dumps(snapshot), encoding='utf-8')
+        dead.write_text(json.dumps(snapshot), encoding='utf-8')
+
+        with override_settings(METRICS_DIR=directory.name), \
+                mock.patch('main.metrics._alive', side_effect=lambda pid: pid == 101):
+            text = render_metrics()
+
+        self.assertIn('portfolio_requests_total{view="main:home"} 5', text)
+        self.assertTrue(live.exists())
+        self.assertFalse(dead.exists())
@@ -0,0 +1,37 @@
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase
+from main.notifications import NotificationDispatcher
+from unittest import mock
+import smtplib
+
+class NotificationDispatcherTests(SimpleTestCase):
+    def start_dispatcher(self):
+        dispatcher = NotificationDispatcher(
+            retry_delay=0, connection_kwargs={'backend': 'django.core.mail.backends.locmem.EmailBackend'}
+        )
+        with mock.patch('main.notifications.atexit'):
+            dispatcher.start()
+        return dispatcher
+
+    def test_retry_queued_behind_stop_is_delivered(self):
+        dispatcher = self.start_dispatcher()
+        message = EmailMessage('Hello', 'Body', 'site@example.com', ['owner@example.com'])
+        # What a retry requeued during shutdown looks like
+        dispatcher.stopping.set()
+        dispatcher.queue.put(None)
+        dispatcher.queue.put((message, 1))
+        for thread in dispatcher.threads:
+            thread.join(timeout=5)
+
+        self.assertEqual([sent.subject for sent in mail.outbox], ['Hello'])
+
+    def test_failed_message_is_retried_during_shutdown(self):
+        dispatcher = self.start_dispatcher()
+        message = EmailMessage('Hello', 'Body', 'site@example.com', ['owner@example.com'])
+        send = mock.Mock(side_effect=[smtplib.SMTPDataError(451, 'try later'), 1])
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', send):
+            dispatcher.send(message)
+            dispatcher.stop(timeout=5)
+        self.assertEqual(send.call_count, 2)
+        self.assertEqual(dispatcher.stats['sent'], 1)
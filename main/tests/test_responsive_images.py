@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from main.images import refresh_variants
+from main.models import About, Project
+from PIL import Image
+import io
+import tempfile
+
+def stored_image(name, size=(1200, 800)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (40, 90, 160)).save(buffer, 'PNG')
+    return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+class ResponsiveImageTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+
+    def test_project_pages_serve_image_variants(self):
+        project = Project.objects.create(title='Portfolio', description='A site', frameworks='Django',
+                                         is_featured=True, image=stored_image('projects/shot.png'))
+        # Runs in the background after a real commit
+        refresh_variants(Project, project.pk, 'image')
+
+        for url in (reverse('main:home'), reverse('main:projects'), project.get_absolute_url()):
+            with self.subTest(url=url):
+                response = self.client.get(url, secure=True)
+                self.assertContains(response, 'srcset=')
+                self.assertContains(response, 'width="1200" height="800"')
+
+    def test_profile_image_serves_variants(self):
+        about = About.objects.create(profile_image=stored_image('profile/me.png', (600, 600)))
+        refresh_variants(About, about.pk, 'profile_image')
+
+        for url in (reverse('main:home'), reverse('main:about')):
+            with self.subTest(url=url):
+                response = self.client.get(url, secure=True)
+                self.assertContains(response, 'srcset=')
+                self.assertContains(response, 'width="600" height="600"')
@@ -0,0 +1,30 @@
+from django.test import TestCase
+from main.models import Project, Technology
+from unittest import mock
+
+class ProjectTechnologyTests(TestCase):
+    def test_links_follow_frameworks(self):
+        project = Project.objects.create(title='Portfolio', description='A site', frameworks='Django, HTMX')
+        self.assertEqual(set(project.technologies.values_list('key', flat=True)), {'django', 'htmx'})
+
+        project = Project.objects.get(pk=project.pk)
+        project.frameworks = 'Django'
+        project.save()
+        self.assertEqual(list(project.technologies.values_list('key', flat=True)), ['django'])
+
+    def test_unrelated_edits_skip_the_indexes(self):
+        project = Project.objects.create(title='Portfolio', description='A site', frameworks='Django')
+        project = Project.objects.get(pk=project.pk)
+        project.title = 'Renamed'
+        with mock.patch.object(Project, 'sync_technologies') as sync, \
+                mock.patch('main.related.update_related_projects') as update:
+            project.save()
+        sync.assert_not_called()
+        update.assert_not_called()
+
+    def test_long_framework_entry_saves(self):
+        name = 'x' * 400
+        project = Project.objects.create(title='Portfolio', description='A site', frameworks=name)
+        self.assertEqual(project.technologies.get().name, name)
+        # SQLite ignores max_length, so check the field itself would hold it
+        Technology.objects.get().full_clean()
@@ -0,0 +1,117 @@
+from django.core.cache import cache
+from hashlib import blake2b
+import math
+import re
+import time
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+def get_client_ip(request):
+    """Return the client address, honouring the X-Forwarded-For set by nginx"""
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if forwarded:
+        # nginx appends the peer it saw; earlier entries are client-supplied
+        return forwarded.split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR')
+
+def _digest(value):
+    return blake2b(value.encode('utf-8'), digest_size=16).hexdigest()
+
+class SlidingWindowLimiter:
+    """Sliding-window rate limiter kept in the cache backend
+
+    Uses the two-bucket approximation: the previous window's count is
+    weighted by how much of it still overlaps the sliding window. It needs
+    two cache reads and one increment per hit and works across workers
+    when the cache is shared.
+    """
+
+    def __init__(self, scope, limit, window):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+
+    def key(self, ident, bucket):
+        return f'main:ratelimit:{self.scope}:{_digest(ident)}:{bucket}'
+
+    def hit(self, ident, now=None):
+        """Count a hit; return seconds to wait if over the limit, else 0"""
+        now = time.time() if now is None else now
+        bucket, offset = divmod(now, self.window)
+        bucket = int(bucket)
+        current_key = self.key(ident, bucket)
+        counts = cache.get_many([current_key, self.key(ident, bucket - 1)])
+        current = counts.get(current_key, 0)
+        previous = counts.get(self.key(ident, bucket - 1), 0)
+        weighted = previous * (1 - offset / self.window) + current
+        if weighted >= self.limit:
+            return int(self.window - offset) + 1
+
+        if not cache.add(current_key, 1, self.window * 2):
+            try:
+                cache.incr(current_key)
+            except ValueError:
+                cache.set(current_key, 1, self.window * 2)
+        return 0
+
+class DuplicateFilter:
+    """Bloom filter over normalized payloads, stored in the cache
+
+    Sized for capacity payloads at error_rate false positives. It rotates
+    after period seconds, or sooner once it holds capacity payloads, and
+    the previous filter is still checked, so entries are remembered for
+    one to two periods and the false-positive rate stays near error_rate
+    however busy it gets. Concurrent writers can lose each other's bits,
+    which only ever lets a duplicate through; it never rejects a new message.
+    """
+
+    def __init__(self, name, capacity=10000, error_rate=0.001, period=86400):
+        self.name = name
+        self.capacity = capacity
+        self.period = period
+        self.bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+
+    def key(self):
+        return f'main:bloom:{self.name}'
+
+    def positions(self, payload):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = blake2b(payload.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def load(self, now):
+        """(started_at, count, current, previous) with stale generations dropped"""
+        state = cache.get(self.key())
+        size = (self.bits + 7) // 8
+        if state is None or len(state[2]) != size or now - state[0] >= self.period * 2:
+            return now, 0, bytes(size), None
+        started_at, count, current, previous = state
+        if now - started_at >= self.period or count >= self.capacity:
+            return now, 0, bytes(size), current if now - started_at < self.period * 2 else None
+        return state
+
+    def seen(self, payload, now=None):
+        """Return True if payload was probably added already"""
+        now = time.time() if now is None else now
+        _, _, current, previous = self.load(now)
+        positions = self.positions(payload)
+        return any(
+            all(stored[p // 8] & (1 << (p % 8)) for p in positions)
+            for stored in (current, previous) if stored
+        )
+
+    def add(self, payload, now=None):
+        """Remember payload; call it once the submission is safely stored"""
+        now = time.time() if now is None else now
+        started_at, count, current, previous = self.load(now)
+        current = bytearray(current)
+        for p in self.positions(payload):
+            current[p // 8] |= 1 << (p % 8)
+        cache.set(self.key(), (started_at, count + 1, bytes(current), previous), self.period * 2)
+
+def normalize_message(email, subject, message):
+    """Canonical form of a submission for duplicate detection"""
+    parts = [email, subject, message]
+    return '\x1f'.join(WHITESPACE_RE.sub(' ', part).strip().lower() for part in parts)
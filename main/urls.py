@@ -1,16 +1,25 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if settings.ASYNC_VIEWS:
+    from . import async_views as public_views
+else:
+    public_views = views
+
 app_name = 'main'
 
 urlpatterns = [
-    path('', views.home, name='home'),
-    path('about/', views.about_view, name='about'),
-    path('projects/', views.projects_view, name='projects'),
-    path('projects/<int:project_id>/', views.project_detail, name='project_detail'),
-    path('contact/submit/', views.contact_submit, name='contact_submit'),
+    path('', public_views.home, name='home'),
+    path('about/', public_views.about_view, name='about'),
+    path('projects/', public_views.projects_view, name='projects'),
+    path('projects/<uuid:project_id>/', public_views.project_detail, name='project_detail'),
+    path('contact/submit/', public_views.contact_submit, name='contact_submit'),
     
     # API endpoints
-    path('api/projects/', views.api_projects, name='api_projects'),
-    path('api/skills/', views.api_skills, name='api_skills'),
+    path('api/projects/', public_views.api_projects, name='api_projects'),
+    path('api/skills/', public_views.api_skills, name='api_skills'),
+
+    # Monitoring
+    path('metrics', views.metrics, name='metrics'),
 ]
@@ -1,30 +1,40 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse, Http404
+from django.http import HttpResponse, JsonResponse, Http404
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import require_http_methods, condition
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.core.files.storage import default_storage
+from django.db.models import Count, Max
 from django.contrib import messages
 from django.utils import timezone
-from .models import About, Experience, Project, ContactMessage
+from django.utils.crypto import constant_time_compare
+from .models import Experience, Project, ContactMessage, Technology
+from .cache import cache_page_by_content
+from .context_processors import get_about
+from .gallery import load_gallery
+from .search import search_projects
+from .pagination import encode_cursor, after_cursor, InvalidCursor
+from .contact_queue import get_contact_queue
+from .notifications import notify_new_messages
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render_metrics
+from .throttling import SlidingWindowLimiter, DuplicateFilter, get_client_ip, normalize_message
+from hashlib import md5
+from ipaddress import ip_address
 import json
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+@cache_page_by_content()
 def home(request):
     """Home page view with featured content"""
     try:
-        about = About.objects.first()
-        if not about:
-            # Create default about if none exists
-            about = About.objects.create()
-        
         featured_projects = Project.objects.filter(is_featured=True).order_by('order', '-created_at')[:3]
         recent_experiences = Experience.objects.all().order_by('-start_date', 'order')[:3]
         
         context = {
-            'about': about,
             'featured_projects': featured_projects,
             'recent_experiences': recent_experiences,
             'page_title': 'Home',
@@ -34,13 +44,10 @@ def home(request):
         logger.error(f"Error in home view: {e}")
         return render(request, 'errors/500.html', status=500)
 
+@cache_page_by_content()
 def about_view(request):
     """About page view with detailed information"""
     try:
-        about = About.objects.first()
-        if not about:
-            about = About.objects.create()
-        
         experiences = Experience.objects.all().order_by('-start_date', 'order')
         
         # Group experiences by type
@@ -49,7 +56,6 @@ def about_view(request):
         certifications = experiences.filter(experience_type='certification')
         
         context = {
-            'about': about,
             'experiences': experiences,
             'work_experiences': work_experiences,
             'education_experiences': education_experiences,
@@ -61,44 +67,54 @@ def about_view(request):
         logger.error(f"Error in about view: {e}")
         return render(request, 'errors/500.html', status=500)
 
+def _filter_projects(request):
+    """Apply the projects page filters; return (queryset, filter context)"""
+    projects_list = Project.objects.all().order_by('-is_featured', 'order', '-created_at')
+    
+    # Search functionality
+    search_query = request.GET.get('search', '')
+    if search_query:
+        projects_list = search_projects(search_query, projects_list)
+    
+    # Filter by featured
+    featured_filter = request.GET.get('featured', '')
+    if featured_filter == 'true':
+        projects_list = projects_list.filter(is_featured=True)
+    
+    # Filter by technology
+    tech_filter = request.GET.get('tech', '')
+    if tech_filter:
+        projects_list = projects_list.filter(technologies__key=Technology.normalize(tech_filter))
+    
+    return projects_list, {
+        'search_query': search_query,
+        'featured_filter': featured_filter,
+        'tech_filter': tech_filter,
+    }
+
+PROJECTS_PAGE_SIZE = 6
+
+@cache_page_by_content(query_params=('search', 'featured', 'tech', 'page'))
 def projects_view(request):
     """Projects page view with filtering and pagination"""
     try:
-        projects_list = Project.objects.all().order_by('-is_featured', 'order', '-created_at')
-        
-        # Search functionality
-        search_query = request.GET.get('search', '')
-        if search_query:
-            projects_list = projects_list.filter(
-                Q(title__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(frameworks__icontains=search_query)
-            )
-        
-        # Filter by featured
-        featured_filter = request.GET.get('featured', '')
-        if featured_filter == 'true':
-            projects_list = projects_list.filter(is_featured=True)
+        projects_list, filters = _filter_projects(request)
         
         # Pagination
-        paginator = Paginator(projects_list, 6)  # Show 6 projects per page
+        paginator = Paginator(projects_list, PROJECTS_PAGE_SIZE)
         page_number = request.GET.get('page')
         projects = paginator.get_page(page_number)
         
-        # Get all unique technologies for filter
-        all_projects = Project.objects.all()
-        technologies = set()
-        for project in all_projects:
-            for tech in project.get_frameworks_list():
-                technologies.add(tech.strip())
-        technologies = sorted(list(technologies))
+        # Technologies with project counts for the filter sidebar
+        technologies = Technology.objects.annotate(
+            project_count=Count('projects')
+        ).filter(project_count__gt=0).order_by('name')
         
         context = {
             'projects': projects,
-            'search_query': search_query,
-            'featured_filter': featured_filter,
             'technologies': technologies,
             'page_title': 'Projects',
+            **filters,
         }
         return render(request, 'main/projects.html', context)
     except Exception as e:
@@ -110,14 +126,15 @@ def project_detail(request, project_id):
     try:
         project = get_object_or_404(Project, id=project_id)
         
-        # Get related projects (same technologies)
-        related_projects = Project.objects.exclude(id=project.id).filter(
-            frameworks__icontains=project.get_frameworks_list()[0] if project.get_frameworks_list() else ''
-        )[:3]
+        # Related projects come from the precomputed similarity index
+        related_projects = Project.objects.filter(
+            neighbour_of__project=project
+        ).order_by('-neighbour_of__score')[:3]
         
         context = {
             'project': project,
             'related_projects': related_projects,
+            'gallery': load_gallery(project),
             'page_title': project.title,
         }
         return render(request, 'main/project_detail.html', context)
@@ -127,6 +144,68 @@ def project_detail(request, project_id):
         logger.error(f"Error in project detail view: {e}")
         return render(request, 'errors/500.html', status=500)
 
+CONTACT_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+def _contact_error(message, status=400):
+    return JsonResponse({
+        'success': False,
+        'message': message
+    }, status=status)
+
+def _clean_contact(request, data):
+    """Validate a contact payload; return (fields, error_response)"""
+    # Validate required fields
+    required_fields = ['name', 'email', 'subject', 'message']
+    for field in required_fields:
+        if not data.get(field, '').strip():
+            return None, _contact_error(f'{field.title()} is required.')
+    
+    # Validate email format
+    if not CONTACT_EMAIL_RE.match(data.get('email', '')):
+        return None, _contact_error('Please enter a valid email address.')
+    
+    fields = {
+        'name': data.get('name').strip(),
+        'email': data.get('email').strip().lower(),
+        # Line breaks have no place in a subject, and would break mail headers
+        'subject': ' '.join(data.get('subject').split()),
+        'message': data.get('message').strip(),
+        'ip_address': get_client_ip(request),
+        'user_agent': request.META.get('HTTP_USER_AGENT', '')[:512],
+    }
+    return fields, None
+
+def _contact_rejection(fields):
+    """Return an error response if the submission is throttled or a duplicate"""
+    # Throttle per client IP and per sender email
+    for scope, ident in (('ip', fields['ip_address']), ('email', fields['email'])):
+        limit, window = settings.CONTACT_RATE_LIMITS[scope]
+        retry_after = SlidingWindowLimiter(f'contact:{scope}', limit, window).hit(ident or '')
+        if retry_after:
+            logger.warning(f"Contact rate limit ({scope}) hit by {fields['ip_address']}")
+            response = _contact_error('Too many messages. Please try again later.', status=429)
+            response['Retry-After'] = str(retry_after)
+            return response
+    
+    # Reject repeated payloads before touching the database
+    if _contact_duplicates().seen(_contact_payload(fields)):
+        return _contact_error('This message has already been sent.', status=409)
+    return None
+
+def _contact_duplicates():
+    return DuplicateFilter('contact', capacity=settings.CONTACT_DUPLICATE_CAPACITY,
+                           period=settings.CONTACT_DUPLICATE_PERIOD)
+
+def _contact_payload(fields):
+    return normalize_message(fields['email'], fields['subject'], fields['message'])
+
+def _remember_contact(fields):
+    """Reject later copies of a submission; only call it once the message is stored or queued"""
+    _contact_duplicates().add(_contact_payload(fields))
+
+CONTACT_SUCCESS_MESSAGE = 'Thank you for your message! I\'ll get back to you within 24 hours.'
+CONTACT_FAILURE_MESSAGE = 'Sorry, there was an error sending your message. Please try again.'
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def contact_submit(request):
@@ -134,74 +213,140 @@ def contact_submit(request):
     try:
         data = json.loads(request.body)
         
-        # Validate required fields
-        required_fields = ['name', 'email', 'subject', 'message']
-        for field in required_fields:
-            if not data.get(field, '').strip():
-                return JsonResponse({
-                    'success': False,
-                    'message': f'{field.title()} is required.'
-                }, status=400)
+        fields, error = _clean_contact(request, data)
+        if error:
+            return error
         
-        # Validate email format
-        import re
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, data.get('email', '')):
-            return JsonResponse({
-                'success': False,
-                'message': 'Please enter a valid email address.'
-            }, status=400)
+        rejection = _contact_rejection(fields)
+        if rejection:
+            return rejection
         
-        # Create contact message
-        contact_message = ContactMessage.objects.create(
-            name=data.get('name').strip(),
-            email=data.get('email').strip().lower(),
-            subject=data.get('subject').strip(),
-            message=data.get('message').strip()
-        )
-        
-        logger.info(f"New contact message from {contact_message.email}")
+        # Queue the message for a batched insert, or write it directly
+        if settings.CONTACT_WRITE_BEHIND and get_contact_queue().submit(fields):
+            logger.info(f"Queued contact message from {fields['email']}")
+        else:
+            contact_message = ContactMessage.objects.create(**fields)
+            logger.info(f"New contact message from {contact_message.email}")
+            notify_new_messages([contact_message])
+        _remember_contact(fields)
         
         return JsonResponse({
             'success': True,
-            'message': 'Thank you for your message! I\'ll get back to you within 24 hours.'
+            'message': CONTACT_SUCCESS_MESSAGE
         })
     
     except json.JSONDecodeError:
-        return JsonResponse({
-            'success': False,
-            'message': 'Invalid data format.'
-        }, status=400)
+        return _contact_error('Invalid data format.')
     except Exception as e:
         logger.error(f"Error in contact submit: {e}")
-        return JsonResponse({
-            'success': False,
-            'message': 'Sorry, there was an error sending your message. Please try again.'
-        }, status=500)
+        return _contact_error(CONTACT_FAILURE_MESSAGE, status=500)
+
+API_PROJECT_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'frameworks': 'frameworks',
+    'project_link': 'project_link',
+    'github_link': 'github_link',
+    'is_featured': 'is_featured',
+    'image_url': 'image',
+    'created_at': 'created_at',
+}
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+
+def _projects_state(request):
+    """Aggregate used for conditional GETs, computed once per request"""
+    if not hasattr(request, '_projects_state'):
+        # Two queries: a lone Max() is read off the end of the updated_at index,
+        # but sharing a query with the count turns it into a full scan
+        request._projects_state = {
+            'last_modified': Project.objects.aggregate(last_modified=Max('updated_at'))['last_modified'],
+            'count': Project.objects.count(),
+        }
+    return request._projects_state
+
+def _projects_etag(request):
+    state = _projects_state(request)
+    last_modified = state['last_modified'].isoformat() if state['last_modified'] else ''
+    raw = f"{last_modified}:{state['count']}:{request.get_full_path()}"
+    return md5(raw.encode('utf-8')).hexdigest()
+
+def _projects_last_modified(request):
+    return _projects_state(request)['last_modified']
+
+def _project_page_query(request):
+    """Parse api_projects parameters; return (queryset, fields, limit, error_response)"""
+    fields = request.GET.get('fields', '')
+    if fields:
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in API_PROJECT_FIELDS]
+        if unknown:
+            return None, None, None, JsonResponse({
+                'success': False,
+                'message': f"Unknown fields: {', '.join(unknown)}."
+            }, status=400)
+    else:
+        fields = list(API_PROJECT_FIELDS)
+    
+    try:
+        limit = min(max(int(request.GET.get('limit', API_PAGE_SIZE)), 1), API_MAX_PAGE_SIZE)
+    except ValueError:
+        limit = API_PAGE_SIZE
+    
+    projects = Project.objects.order_by('-is_featured', 'order', '-created_at', 'id')
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            projects = projects.filter(after_cursor(cursor))
+        except InvalidCursor:
+            return None, None, None, JsonResponse({
+                'success': False,
+                'message': 'Invalid cursor.'
+            }, status=400)
+    
+    columns = {API_PROJECT_FIELDS[field] for field in fields}
+    columns.update(['id', 'is_featured', 'order', 'created_at'])
+    # One extra row tells whether another page follows
+    return projects.values(*columns)[:limit + 1], fields, limit, None
 
+def _project_page_response(rows, fields, limit):
+    """Serialize one page of api_projects rows"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    projects_data = []
+    for row in rows:
+        item = {}
+        for field in fields:
+            value = row[API_PROJECT_FIELDS[field]]
+            if field == 'frameworks':
+                value = [fw.strip() for fw in value.split(',') if fw.strip()]
+            elif field == 'image_url':
+                value = default_storage.url(value) if value else None
+            elif field == 'created_at':
+                value = value.isoformat()
+            item[field] = value
+        projects_data.append(item)
+    
+    return JsonResponse({
+        'success': True,
+        'projects': projects_data,
+        'next_cursor': encode_cursor(rows[-1]) if has_more else None,
+    })
+
+@condition(etag_func=_projects_etag, last_modified_func=_projects_last_modified)
 def api_projects(request):
-    """API endpoint for projects (for AJAX requests)"""
+    """API endpoint for projects (for AJAX requests)
+
+    Supports keyset pagination (``cursor``, ``limit``), sparse fieldsets
+    (``fields``) and conditional GET through ETag/Last-Modified.
+    """
     try:
-        projects = Project.objects.all().order_by('-is_featured', 'order', '-created_at')
-        
-        projects_data = []
-        for project in projects:
-            projects_data.append({
-                'id': project.id,
-                'title': project.title,
-                'description': project.description,
-                'frameworks': project.get_frameworks_list(),
-                'project_link': project.project_link,
-                'github_link': project.github_link,
-                'is_featured': project.is_featured,
-                'image_url': project.image.url if project.image else None,
-                'created_at': project.created_at.isoformat(),
-            })
-        
-        return JsonResponse({
-            'success': True,
-            'projects': projects_data
-        })
+        rows, fields, limit, error = _project_page_query(request)
+        if error:
+            return error
+        return _project_page_response(list(rows), fields, limit)
     except Exception as e:
         logger.error(f"Error in API projects: {e}")
         return JsonResponse({
@@ -212,18 +357,16 @@ def api_projects(request):
 def api_skills(request):
     """API endpoint for skills"""
     try:
-        about = About.objects.first()
+        about = get_about()
         if not about:
             return JsonResponse({
                 'success': False,
                 'message': 'No skills data found.'
             }, status=404)
         
-        skills_list = [skill.strip() for skill in about.skills.split(',') if skill.strip()]
-        
         return JsonResponse({
             'success': True,
-            'skills': skills_list
+            'skills': about.get_skills_list()
         })
     except Exception as e:
         logger.error(f"Error in API skills: {e}")
@@ -232,6 +375,28 @@ def api_skills(request):
             'message': 'Error fetching skills.'
         }, status=500)
 
+def _metrics_allowed(request):
+    """With METRICS_TOKEN, requests bearing it; otherwise only direct ones from this host"""
+    token = settings.METRICS_TOKEN
+    if token:
+        return constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    try:
+        loopback = ip_address(request.META.get('REMOTE_ADDR', '')).is_loopback
+    except ValueError:
+        return False
+    # A proxy on the same host relays public requests from loopback too
+    return loopback and 'X-Forwarded-For' not in request.headers
+
+def metrics(request):
+    """Prometheus metrics endpoint"""
+    if not _metrics_allowed(request):
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    try:
+        return HttpResponse(render_metrics(), content_type=METRICS_CONTENT_TYPE)
+    except Exception as e:
+        logger.error(f"Error in metrics view: {e}")
+        return HttpResponse('Error collecting metrics', status=500, content_type='text/plain')
+
 # Error handlers
 def handler404(request, exception):
     """Custom 404 error handler"""
@@ -0,0 +1,7 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio.settings')
+# Under ASGI the public views run natively async instead of in a thread pool
+os.environ.setdefault('ASYNC_VIEWS', 'True')
+application = get_asgi_application()
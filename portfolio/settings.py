@@ -22,6 +22,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'main.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -35,7 +36,7 @@ ROOT_URLCONF = 'portfolio.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'main.metrics.InstrumentedTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -44,12 +45,14 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'main.context_processors.owner',
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'portfolio.wsgi.application'
+ASGI_APPLICATION = 'portfolio.asgi.application'
 
 # Database
 DATABASE_URL = os.environ.get('DATABASE_URL')
@@ -91,10 +94,35 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Vendored Font Awesome and text fonts that manage.py build_fonts subsets
+FONT_SOURCE_DIR = os.environ.get('FONT_SOURCE_DIR', str(BASE_DIR / 'assets' / 'fonts'))
+
+# collectstatic writes content-hashed, minified files with .gz siblings
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'main.staticfiles.CompressedManifestStaticFilesStorage',
+    },
+}
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Resized copies of uploaded images (manage.py generate_image_variants)
+IMAGE_VARIANT_WIDTHS = [int(width) for width in os.environ.get('IMAGE_VARIANT_WIDTHS', '320,640,960,1280').split(',')]
+IMAGE_VARIANT_QUALITY = int(os.environ.get('IMAGE_VARIANT_QUALITY', '80'))
+IMAGE_VARIANT_WORKERS = int(os.environ.get('IMAGE_VARIANT_WORKERS', '1'))
+
+# Public address of the site, for links built outside a request
+SITE_URL = os.environ.get('SITE_URL', 'http://localhost:8000')
+
+# Pre-built sitemap files served by nginx (manage.py build_sitemaps)
+SITEMAP_ROOT = os.environ.get('SITEMAP_ROOT', str(BASE_DIR / 'sitemaps'))
+SITEMAP_SHARD_SIZE = int(os.environ.get('SITEMAP_SHARD_SIZE', '50000'))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Logging
@@ -152,7 +180,7 @@ if not DEBUG:
     SECURE_HSTS_INCLUDE_SUBDOMAINS = True
     SECURE_HSTS_SECONDS = 31536000
     SECURE_REDIRECT_EXEMPT = []
-    SECURE_SSL_REDIRECT = True
+    SECURE_SSL_REDIRECT = os.environ.get('SECURE_SSL_REDIRECT', 'True').lower() == 'true'
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
     X_FRAME_OPTIONS = 'DENY'
@@ -167,12 +195,33 @@ EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@abdulaziz.dev')
 
 # Cache settings
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    # Shared cache so page invalidation reaches every gunicorn worker
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
     }
-}
+else:
+    # Per process: invalidation from commands or other workers never arrives,
+    # so gunicorn.conf.py refuses to start more than one worker on it
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+        }
+    }
+
+# Serve the public views with the async ORM (portfolio.asgi turns this on)
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'False').lower() == 'true'
+
+# Full-page cache lifetime in seconds (0 disables it)
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', '3600'))
+
+# Lifetime of cached project cards and skill lists in seconds (0 disables it)
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('FRAGMENT_CACHE_TIMEOUT', '86400'))
 
 # Session settings
 SESSION_COOKIE_AGE = 86400  # 24 hours
@@ -185,3 +234,41 @@ USE_THOUSAND_SEPARATOR = True
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
+
+# Project search: ranked results kept per query (the backend follows the database)
+SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS', '500'))
+
+# Number of precomputed related projects kept per project
+RELATED_PROJECTS_LIMIT = 6
+
+# Contact form write-behind: queue submissions and insert them in batches
+CONTACT_WRITE_BEHIND = os.environ.get('CONTACT_WRITE_BEHIND', 'False').lower() == 'true'
+CONTACT_QUEUE_SPOOL_DIR = BASE_DIR / 'spool'
+CONTACT_QUEUE_MAX_SIZE = int(os.environ.get('CONTACT_QUEUE_MAX_SIZE', '1000'))
+CONTACT_QUEUE_BATCH_SIZE = int(os.environ.get('CONTACT_QUEUE_BATCH_SIZE', '50'))
+CONTACT_QUEUE_FLUSH_INTERVAL = float(os.environ.get('CONTACT_QUEUE_FLUSH_INTERVAL', '1.0'))
+
+# Contact notifications, sent from background workers over persistent SMTP connections
+CONTACT_NOTIFICATIONS = os.environ.get('CONTACT_NOTIFICATIONS', 'False').lower() == 'true'
+CONTACT_NOTIFY_EMAIL = os.environ.get('CONTACT_NOTIFY_EMAIL', '')
+CONTACT_AUTO_REPLY = os.environ.get('CONTACT_AUTO_REPLY', 'False').lower() == 'true'
+NOTIFICATION_WORKERS = int(os.environ.get('NOTIFICATION_WORKERS', '1'))
+NOTIFICATION_BATCH_SIZE = int(os.environ.get('NOTIFICATION_BATCH_SIZE', '20'))
+NOTIFICATION_MAX_RETRIES = int(os.environ.get('NOTIFICATION_MAX_RETRIES', '5'))
+
+# Contact form throttling: (requests, window in seconds) per client IP and per email
+CONTACT_RATE_LIMITS = {
+    'ip': (5, 600),
+    'email': (3, 3600),
+}
+# Repeated submissions are remembered for one to two periods (seconds), or
+# less when more than CONTACT_DUPLICATE_CAPACITY arrive in one period
+CONTACT_DUPLICATE_PERIOD = 86400
+CONTACT_DUPLICATE_CAPACITY = int(os.environ.get('CONTACT_DUPLICATE_CAPACITY', '10000'))
+
+# Prometheus metrics at /metrics. Point METRICS_DIR at a directory shared by
+# all gunicorn workers (emptied on deploy) to report every worker at once.
+METRICS_DIR = os.environ.get('METRICS_DIR', '')
+METRICS_WRITE_INTERVAL = float(os.environ.get('METRICS_WRITE_INTERVAL', '1.0'))
+# Without a token, /metrics answers only direct requests from this host
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')